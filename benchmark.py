@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Generation Benchmark for AI Agent Ideation Generator
+
+This script runs the generation engine end to end (prompt, Ollama request, similarity
+check, saving, index and database writes) against a mock Ollama server, in a scratch
+copy of the idea folders seeded with a corpus of made-up ideas. For each corpus size
+and concurrency level it reports ideas per second, the p50/p95 request latency and
+the time spent in each pipeline stage, so changes can be compared on numbers.
+
+The repository's own ideas, index and database are never touched. Pass --ollama-url
+to benchmark a real Ollama server instead of the mock.
+"""
+
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+from contextlib import contextmanager
+from typing import List, Dict, Any
+
+import ollama_client
+import generate_agent_ideas
+from generate_agent_ideas import (
+    GenerationEngine, load_categories, load_template, get_category_folder_name,
+    print_header, print_info, print_error
+)
+from idea_store import IdeaStore
+from metrics import get_metrics
+from similarity_index import SIMILARITY_BACKENDS, DEFAULT_SIMILARITY_BACKEND
+from mock_ollama import MockOllamaServer, make_idea
+
+DEFAULT_IDEAS = 50
+DEFAULT_CORPUS_SIZES = "0,500,2000"
+DEFAULT_CONCURRENCY_LEVELS = "1,4,8"
+DEFAULT_MODEL = "mock"
+
+# Pipeline stages timed by the generation engine, in pipeline order
+STAGES = ["prompt", "request", "similarity", "save", "index", "store", "flush", "render_index"]
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Get a percentile of a list of values by linear interpolation (0.0 if empty)."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+@contextmanager
+def scratch_repo(corpus_size: int, categories: List[str], seed: int):
+    """Point the generator at a temporary idea folder seeded with made-up ideas.
+    
+    Args:
+        corpus_size: Number of existing ideas, spread over the categories
+        categories: The categories to create ideas for
+        seed: Seed for the made-up ideas
+    """
+    scratch = tempfile.mkdtemp(prefix="ideation-benchmark-")
+    saved = {name: getattr(generate_agent_ideas, name)
+             for name in ("REPO_PATH", "CATEGORIES_DIR", "INDEX_FILE", "INDEX_LEDGER_FILE")}
+    try:
+        categories_dir = os.path.join(scratch, "by-category")
+        rng = random.Random(seed)
+        for number in range(corpus_size):
+            category = categories[number % len(categories)]
+            folder = os.path.join(categories_dir, get_category_folder_name(category))
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, f"corpus-idea-{number}.md"), 'w') as f:
+                f.write(make_idea(category, rng))
+        
+        generate_agent_ideas.REPO_PATH = scratch
+        generate_agent_ideas.CATEGORIES_DIR = categories_dir
+        generate_agent_ideas.INDEX_FILE = os.path.join(scratch, "index.md")
+        generate_agent_ideas.INDEX_LEDGER_FILE = os.path.join(scratch, "index.jsonl")
+        yield scratch
+    finally:
+        for name, value in saved.items():
+            setattr(generate_agent_ideas, name, value)
+        shutil.rmtree(scratch, ignore_errors=True)
+
+def run_scenario(model: str, template: str, categories: List[str], num_ideas: int, corpus_size: int,
+                 concurrency: int, stream: bool = False, similarity_backend: str = DEFAULT_SIMILARITY_BACKEND,
+                 seed: int = 0, adaptive: bool = False) -> Dict[str, Any]:
+    """Generate num_ideas ideas in a scratch repository and measure the run.
+    
+    Returns:
+        The scenario settings, run statistics, throughput, latency percentiles and stage timings
+    """
+    with scratch_repo(corpus_size, categories, seed) as scratch:
+        random.seed(seed)
+        latencies = []
+        
+        def on_event(event: str, data: Dict[str, Any]):
+            if event in ("generated", "skipped", "error") and data.get("latency") is not None:
+                latencies.append(data["latency"])
+        
+        store = IdeaStore(os.path.join(scratch, "ideas.db"))
+        try:
+            engine = GenerationEngine(model, template, categories, concurrency=concurrency, stream=stream,
+                                      similarity_backend=similarity_backend, on_event=on_event, store=store,
+                                      adaptive_concurrency=adaptive)
+            get_metrics().reset()
+            started = time.perf_counter()
+            stats = engine.run(num_ideas)
+            elapsed = time.perf_counter() - started
+        finally:
+            store.close()
+    
+    return {
+        "corpus_size": corpus_size,
+        "concurrency": concurrency,
+        "stream": stream,
+        "similarity_backend": similarity_backend,
+        "final_limit": engine.in_flight_limit,
+        **stats,
+        "seconds": elapsed,
+        "ideas_per_second": stats["generated"] / elapsed if elapsed > 0 else 0.0,
+        "latency_p50_ms": percentile(latencies, 0.50) * 1000,
+        "latency_p95_ms": percentile(latencies, 0.95) * 1000,
+        "stages": get_metrics().stage_summary()
+    }
+
+def print_results(results: List[Dict[str, Any]]):
+    """Print the throughput table and the per-stage mean times."""
+    print_header("Throughput")
+    print(f"{'corpus':>7} {'conc':>5} {'ideas':>6} {'skip':>5} {'err':>4} {'secs':>7} "
+          f"{'ideas/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'limit':>6}")
+    for result in results:
+        print(f"{result['corpus_size']:>7} {result['concurrency']:>5} {result['generated']:>6} "
+              f"{result['skipped']:>5} {result['errors']:>4} {result['seconds']:>7.2f} "
+              f"{result['ideas_per_second']:>8.2f} {result['latency_p50_ms']:>8.1f} {result['latency_p95_ms']:>8.1f} "
+              f"{result['final_limit']:>6}")
+    
+    print_header("Mean milliseconds per call")
+    print(f"{'corpus':>7} {'conc':>5} " + " ".join(f"{stage:>12}" for stage in STAGES))
+    for result in results:
+        print(f"{result['corpus_size']:>7} {result['concurrency']:>5} " +
+              " ".join(f"{result['stages'].get(stage, {}).get('mean_ms', 0.0):>12.2f}" for stage in STAGES))
+
+def parse_int_list(value: str) -> List[int]:
+    """Parse a comma-separated list of integers, e.g. "1,4,8"."""
+    return [int(item) for item in value.split(",") if item.strip()]
+
+def main():
+    """Run the benchmark scenarios and report the results."""
+    parser = argparse.ArgumentParser(description="Benchmark the idea generation pipeline against a mock Ollama server")
+    parser.add_argument("--ideas", type=int, default=DEFAULT_IDEAS, help=f"Ideas to generate per scenario (default: {DEFAULT_IDEAS})")
+    parser.add_argument("--corpus-sizes", type=str, default=DEFAULT_CORPUS_SIZES, help=f"Comma-separated numbers of existing ideas (default: {DEFAULT_CORPUS_SIZES})")
+    parser.add_argument("--concurrency", type=str, default=DEFAULT_CONCURRENCY_LEVELS, help=f"Comma-separated concurrency levels (default: {DEFAULT_CONCURRENCY_LEVELS})")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock server seconds before the first token (default: 0.05)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Mock server latency jitter in seconds (default: 0)")
+    parser.add_argument("--token-rate", type=float, default=0.0, help="Mock server tokens per second, 0 for instant answers (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of mock requests that fail (default: 0)")
+    parser.add_argument("--parallel", type=int, default=0, help="Mock server generations processed at once, 0 for no limit (default: 0)")
+    parser.add_argument("--adaptive", action="store_true", help="Let the adaptive concurrency controller pick the limit, up to each concurrency level")
+    parser.add_argument("--stream", action="store_true", help="Stream responses")
+    parser.add_argument("--similarity-backend", choices=sorted(SIMILARITY_BACKENDS), default=DEFAULT_SIMILARITY_BACKEND, help=f"Duplicate detection backend (default: {DEFAULT_SIMILARITY_BACKEND})")
+    parser.add_argument("--template", type=str, default=None, help="Idea template from the templates folder")
+    parser.add_argument("--ollama-url", type=str, default=None, help="Benchmark this Ollama server instead of the mock")
+    parser.add_argument("--model", type=str, default=DEFAULT_MODEL, help=f"Model to request (default: {DEFAULT_MODEL})")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for corpora, categories and mock output (default: 0)")
+    parser.add_argument("--json", type=str, default=None, metavar="FILE", help="Also write the results to a JSON file")
+    args = parser.parse_args()
+    
+    try:
+        corpus_sizes = parse_int_list(args.corpus_sizes)
+        concurrency_levels = parse_int_list(args.concurrency)
+    except ValueError:
+        print_error("Corpus sizes and concurrency levels must be comma-separated integers")
+        return
+    if args.ideas <= 0 or min(concurrency_levels, default=0) <= 0 or min(corpus_sizes, default=-1) < 0:
+        print_error("Ideas and concurrency levels must be positive and corpus sizes non-negative")
+        return
+    
+    categories = load_categories()
+    if not categories:
+        print_error("No categories found. Please check the categories file.")
+        return
+    template = load_template(args.template)
+    
+    server = None
+    if args.ollama_url:
+        ollama_client.OLLAMA_BASE_URL = args.ollama_url
+    else:
+        server = MockOllamaServer(port=0, latency=args.latency, jitter=args.jitter, token_rate=args.token_rate,
+                                  error_rate=args.error_rate, parallel=args.parallel, models=[args.model],
+                                  seed=args.seed).start()
+        ollama_client.OLLAMA_BASE_URL = server.url
+    
+    print_header("AI Agent Ideation Benchmark")
+    print_info(f"Ollama: {ollama_client.OLLAMA_BASE_URL}" + (" (mock)" if server else ""))
+    print_info(f"Ideas per scenario: {args.ideas}, corpus sizes: {corpus_sizes}, concurrency: {concurrency_levels}")
+    
+    results = []
+    try:
+        for corpus_size in corpus_sizes:
+            for concurrency in concurrency_levels:
+                print_info(f"Running corpus={corpus_size} concurrency={concurrency}...")
+                results.append(run_scenario(args.model, template, categories, args.ideas, corpus_size, concurrency,
+                                            args.stream, args.similarity_backend, args.seed, args.adaptive))
+    except KeyboardInterrupt:
+        print_info("Benchmark interrupted")
+    finally:
+        if server is not None:
+            server.stop()
+    
+    if results:
+        print_results(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print_info(f"Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Concurrency Controller for AI Agent Ideation Generator
+
+This module adapts the number of in-flight Ollama requests to what the server can
+take, so runs do not depend on a hand-tuned --concurrency value. It is an AIMD
+(additive increase, multiplicative decrease) controller, as used for TCP congestion
+control: while requests succeed and their smoothed latency stays close to the
+baseline (the lowest smoothed latency seen recently, i.e. requests that did not
+queue), the limit grows by one request per window of completed requests. When the
+latency climbs past a multiple of the baseline the limit is trimmed, and when a
+request times out or fails it is halved, at most once per window so requests that
+were already in flight do not cut it again. The run settles near the server's
+saturation point, where more parallel requests would only wait in Ollama's queue.
+"""
+
+import threading
+from collections import deque
+from typing import Optional
+
+# Constants
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_LATENCY_TOLERANCE = 1.5  # Back off once smoothed latency exceeds this multiple of the baseline
+DEFAULT_BACKOFF_FACTOR = 0.5  # Multiply the limit by this when requests time out or fail
+DEFAULT_LATENCY_BACKOFF_FACTOR = 0.8  # Multiply the limit by this when latency climbs
+LATENCY_SMOOTHING = 0.2  # Weight of the newest sample in the smoothed latency
+BASELINE_WINDOW = 500  # Recent smoothed latencies the baseline is the minimum of
+
+class AdaptiveConcurrencyController:
+    """AIMD controller for the number of concurrent Ollama requests."""
+    
+    def __init__(self, max_limit: int, min_limit: int = DEFAULT_MIN_LIMIT, initial_limit: Optional[int] = None,
+                 latency_tolerance: float = DEFAULT_LATENCY_TOLERANCE,
+                 backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+                 latency_backoff_factor: float = DEFAULT_LATENCY_BACKOFF_FACTOR):
+        """Initialize the controller.
+        
+        Args:
+            max_limit: Highest number of concurrent requests to allow
+            min_limit: Lowest number of concurrent requests to fall back to
+            initial_limit: Starting limit (defaults to min_limit)
+            latency_tolerance: Multiple of the baseline latency that counts as overload
+            backoff_factor: Factor the limit is multiplied by when a request fails (0.0-1.0)
+            latency_backoff_factor: Factor the limit is multiplied by when latency is too high (0.0-1.0)
+        """
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.latency_tolerance = latency_tolerance
+        self.backoff_factor = backoff_factor
+        self.latency_backoff_factor = latency_backoff_factor
+        self._limit = float(min(self.max_limit, max(self.min_limit, initial_limit or self.min_limit)))
+        self._slow_start = True  # Grow by one per success (doubling per window) until the first overload
+        self._samples = deque(maxlen=BASELINE_WINDOW)
+        self._smoothed: Optional[float] = None
+        self._since_decrease = 0  # Requests completed since the last decrease
+        self._lock = threading.Lock()
+    
+    @property
+    def limit(self) -> int:
+        """The number of requests that may currently be in flight."""
+        with self._lock:
+            return int(self._limit)
+    
+    def on_success(self, latency: float):
+        """Record a completed request and its latency in seconds."""
+        with self._lock:
+            self._smoothed = latency if self._smoothed is None else (
+                LATENCY_SMOOTHING * latency + (1 - LATENCY_SMOOTHING) * self._smoothed)
+            # Smoothed values keep one lucky fast response from setting the baseline
+            self._samples.append(self._smoothed)
+            self._since_decrease += 1
+            
+            if self._smoothed > min(self._samples) * self.latency_tolerance:
+                self._decrease(self.latency_backoff_factor)
+            elif self._slow_start:
+                self._limit = min(self.max_limit, self._limit + 1)
+            else:
+                # One more request per window of `limit` completions
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+    
+    def on_failure(self):
+        """Record a request that timed out or failed because the server is overloaded."""
+        with self._lock:
+            self._since_decrease += 1
+            self._decrease(self.backoff_factor)
+    
+    def _decrease(self, factor: float):
+        """Cut the limit, once per window of completions (call with the lock held)."""
+        if self._since_decrease < int(self._limit):
+            return
+        self._slow_start = False
+        self._limit = max(self.min_limit, self._limit * factor)
+        self._since_decrease = 0
@@ -8,6 +8,8 @@ This script creates the SQLite database schema for storing AI agent ideas.
 import os
 import sqlite3
 import re
+import hashlib
+import argparse
 from datetime import datetime
 from typing import List, Dict, Any
 
@@ -17,17 +19,15 @@ DB_PATH = os.path.join(REPO_PATH, "ideas.db")
 CATEGORIES_DIR = os.path.join(REPO_PATH, "by-category")
 INDEX_FILE = os.path.join(REPO_PATH, "index.md")
 
-def create_database():
-    """Create the SQLite database and tables."""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
+def create_schema(cursor):
+    """Create the tables if they don't exist."""
     # Create categories table
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS categories (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         name TEXT UNIQUE NOT NULL,
-        folder_name TEXT UNIQUE NOT NULL
+        folder_name TEXT UNIQUE NOT NULL,
+        idea_count INTEGER NOT NULL DEFAULT 0
     )
     ''')
     
@@ -45,6 +45,143 @@ def create_database():
     )
     ''')
     
+    # Covering indexes for the sorted, paginated idea lists of the web viewer
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ideas_created_at ON ideas (created_at, id, name, category_id, file_path)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ideas_name ON ideas (name, id, category_id, file_path, created_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_ideas_category ON ideas (category_id, created_at, id, name, file_path)")
+    
+    create_category_counts(cursor)
+    
+    create_fts_index(cursor)
+    
+    # Create rendered HTML cache table, keyed by idea and checked against a hash of its content
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS idea_html (
+        idea_id INTEGER PRIMARY KEY,
+        content_hash TEXT NOT NULL,
+        html TEXT NOT NULL,
+        FOREIGN KEY (idea_id) REFERENCES ideas (id)
+    )
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS idea_html_delete AFTER DELETE ON ideas BEGIN
+        DELETE FROM idea_html WHERE idea_id = old.id;
+    END
+    ''')
+    
+    # Create per-idea generation statistics table, as reported by Ollama (durations in nanoseconds)
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS idea_generation_stats (
+        idea_id INTEGER PRIMARY KEY,
+        model TEXT,
+        creativity_level TEXT,
+        prompt_eval_count INTEGER,
+        prompt_eval_duration INTEGER,
+        eval_count INTEGER,
+        eval_duration INTEGER,
+        load_duration INTEGER,
+        total_duration INTEGER,
+        FOREIGN KEY (idea_id) REFERENCES ideas (id)
+    )
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS idea_generation_stats_delete AFTER DELETE ON ideas BEGIN
+        DELETE FROM idea_generation_stats WHERE idea_id = old.id;
+    END
+    ''')
+    
+    # Create file manifest table used by incremental syncs
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS file_manifest (
+        file_path TEXT PRIMARY KEY,
+        mtime REAL NOT NULL,
+        size INTEGER NOT NULL,
+        content_hash TEXT NOT NULL
+    )
+    ''')
+
+def create_category_counts(cursor):
+    """Maintain the number of ideas of each category in categories.idea_count."""
+    cursor.execute("PRAGMA table_info(categories)")
+    if 'idea_count' not in [row[1] for row in cursor.fetchall()]:
+        # Databases created before the column existed are counted once
+        cursor.execute("ALTER TABLE categories ADD COLUMN idea_count INTEGER NOT NULL DEFAULT 0")
+        cursor.execute('''
+        UPDATE categories
+        SET idea_count = (SELECT COUNT(*) FROM ideas WHERE ideas.category_id = categories.id)
+        ''')
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS categories_count_insert AFTER INSERT ON ideas BEGIN
+        UPDATE categories SET idea_count = idea_count + 1 WHERE id = new.category_id;
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS categories_count_delete AFTER DELETE ON ideas BEGIN
+        UPDATE categories SET idea_count = idea_count - 1 WHERE id = old.category_id;
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS categories_count_update AFTER UPDATE OF category_id ON ideas
+    WHEN old.category_id != new.category_id BEGIN
+        UPDATE categories SET idea_count = idea_count - 1 WHERE id = old.category_id;
+        UPDATE categories SET idea_count = idea_count + 1 WHERE id = new.category_id;
+    END
+    ''')
+
+def create_fts_index(cursor) -> bool:
+    """Create the FTS5 full-text index over ideas and the triggers that keep it in sync.
+    
+    Returns:
+        False if this SQLite build has no FTS5 support
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ideas_fts'")
+    if cursor.fetchone():
+        return True
+    
+    try:
+        cursor.execute('''
+        CREATE VIRTUAL TABLE ideas_fts USING fts5(
+            name, description, content,
+            content='ideas', content_rowid='id'
+        )
+        ''')
+    except sqlite3.OperationalError as e:
+        print(f"Full-text search is unavailable: {str(e)}")
+        return False
+    
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS ideas_fts_insert AFTER INSERT ON ideas BEGIN
+        INSERT INTO ideas_fts (rowid, name, description, content)
+        VALUES (new.id, new.name, new.description, new.content);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS ideas_fts_delete AFTER DELETE ON ideas BEGIN
+        INSERT INTO ideas_fts (ideas_fts, rowid, name, description, content)
+        VALUES ('delete', old.id, old.name, old.description, old.content);
+    END
+    ''')
+    cursor.execute('''
+    CREATE TRIGGER IF NOT EXISTS ideas_fts_update AFTER UPDATE ON ideas BEGIN
+        INSERT INTO ideas_fts (ideas_fts, rowid, name, description, content)
+        VALUES ('delete', old.id, old.name, old.description, old.content);
+        INSERT INTO ideas_fts (rowid, name, description, content)
+        VALUES (new.id, new.name, new.description, new.content);
+    END
+    ''')
+    
+    # Index the ideas that already exist
+    cursor.execute("INSERT INTO ideas_fts (ideas_fts) VALUES ('rebuild')")
+    return True
+
+def create_database():
+    """Create the SQLite database and tables."""
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    
+    create_schema(cursor)
+    
     conn.commit()
     conn.close()
     
@@ -158,6 +295,123 @@ def import_existing_ideas():
     
     print(f"Imported {idea_count} ideas across {category_count} categories.")
 
+def sync_ideas(verbose: bool = True) -> Dict[str, int]:
+    """Bring the database up to date with the markdown files in by-category.
+    
+    Files whose size and modification time match the stored manifest are skipped
+    without being read. Changed files are hashed, and only new or modified content
+    is upserted, in bulk. Ideas whose tracked file has been deleted are removed.
+    
+    Returns:
+        Counts of scanned, added or updated, unchanged and removed files
+    """
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    create_schema(cursor)
+    
+    cursor.execute("SELECT file_path, mtime, size, content_hash FROM file_manifest")
+    manifest = {row[0]: row[1:] for row in cursor.fetchall()}
+    
+    stats = {"scanned": 0, "upserted": 0, "unchanged": 0, "removed": 0}
+    seen = set()
+    changed_ideas = []
+    manifest_rows = []
+    folder_names = []
+    
+    if os.path.exists(CATEGORIES_DIR):
+        for folder_name in sorted(os.listdir(CATEGORIES_DIR)):
+            category_path = os.path.join(CATEGORIES_DIR, folder_name)
+            if not os.path.isdir(category_path):
+                continue
+            folder_names.append(folder_name)
+            
+            with os.scandir(category_path) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.md') or entry.name == 'prompt.md' or not entry.is_file():
+                        continue
+                    
+                    stats["scanned"] += 1
+                    file_path = os.path.relpath(entry.path, REPO_PATH).replace(os.sep, '/')
+                    seen.add(file_path)
+                    stat = entry.stat()
+                    
+                    known = manifest.get(file_path)
+                    if known and known[0] == stat.st_mtime and known[1] == stat.st_size:
+                        stats["unchanged"] += 1
+                        continue
+                    
+                    with open(entry.path, 'rb') as f:
+                        data = f.read()
+                    content_hash = hashlib.sha256(data).hexdigest()
+                    manifest_rows.append((file_path, stat.st_mtime, stat.st_size, content_hash))
+                    
+                    if known and known[2] == content_hash:
+                        # Touched but not modified
+                        stats["unchanged"] += 1
+                        continue
+                    
+                    content = data.decode('utf-8', errors='replace')
+                    name_match = re.search(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n', content)
+                    name = name_match.group(1).strip() if name_match else entry.name[:-3].replace('-', ' ').title()
+                    desc_match = re.search(r'## 2\. Short Description:\s*\n\s*(.+?)\s*\n## ', content, re.DOTALL)
+                    description = desc_match.group(1).strip() if desc_match else ""
+                    created_at = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
+                    
+                    changed_ideas.append((name, description, folder_name, file_path, created_at, content))
+    
+    removed = [path for path in manifest if path not in seen]
+    
+    with conn:
+        # Make sure every folder has a category, then map folders to IDs in one query
+        cursor.executemany(
+            "INSERT OR IGNORE INTO categories (name, folder_name) VALUES (?, ?)",
+            [(folder_name.replace('-', ' ').title(), folder_name) for folder_name in folder_names]
+        )
+        cursor.execute("SELECT folder_name, id FROM categories")
+        category_ids = dict(cursor.fetchall())
+        
+        cursor.executemany(
+            """
+            INSERT INTO ideas (name, description, category_id, file_path, created_at, content)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(file_path) DO UPDATE SET
+                name = excluded.name,
+                description = excluded.description,
+                category_id = excluded.category_id,
+                content = excluded.content
+            """,
+            [(name, description, category_ids[folder_name], file_path, created_at, content)
+             for name, description, folder_name, file_path, created_at, content in changed_ideas
+             if folder_name in category_ids]
+        )
+        cursor.executemany(
+            "INSERT OR REPLACE INTO file_manifest (file_path, mtime, size, content_hash) VALUES (?, ?, ?, ?)",
+            manifest_rows
+        )
+        
+        if removed:
+            cursor.executemany("DELETE FROM ideas WHERE file_path = ?", [(path,) for path in removed])
+            cursor.executemany("DELETE FROM file_manifest WHERE file_path = ?", [(path,) for path in removed])
+    
+    stats["upserted"] = len(changed_ideas)
+    stats["removed"] = len(removed)
+    conn.close()
+    
+    if verbose:
+        print(f"Synced {stats['scanned']} files: {stats['upserted']} added or updated, "
+              f"{stats['unchanged']} unchanged, {stats['removed']} removed.")
+    
+    return stats
+
 if __name__ == "__main__":
-    create_database()
-    import_existing_ideas()
+    parser = argparse.ArgumentParser(description="Set up or update the AI agent ideas database")
+    parser.add_argument("--sync", action="store_true", help="Incrementally sync the database with the by-category folder")
+    args = parser.parse_args()
+    
+    if args.sync and os.path.exists(DB_PATH):
+        sync_ideas()
+    else:
+        create_database()
+        import_existing_ideas()
+        if args.sync:
+            sync_ideas()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Event Bus for AI Agent Ideation Generator
+
+This module carries progress events from a generation run to any number of
+listeners, such as the web viewer's server-sent event streams. Publishers never
+block on listeners: events go into a bounded history, and each subscriber waits on
+a condition variable until there is something new, instead of polling.
+"""
+
+import time
+import threading
+from collections import deque
+from typing import List, Dict, Any, Iterator, Optional
+
+HISTORY_SIZE = 500  # Events kept for subscribers that connect late or reconnect
+HEARTBEAT_INTERVAL = 15.0  # Seconds a subscriber waits before being woken without events
+
+class EventBus:
+    """Publish/subscribe channel for the events of one generation run."""
+    
+    def __init__(self, history_size: int = HISTORY_SIZE):
+        self._events = deque(maxlen=history_size)
+        self._last_id = 0
+        self._closed = False
+        self._condition = threading.Condition()
+    
+    @property
+    def last_id(self) -> int:
+        """The ID of the most recent event (0 if none has been published)."""
+        with self._condition:
+            return self._last_id
+    
+    @property
+    def closed(self) -> bool:
+        """Whether the run has finished and no more events will be published."""
+        with self._condition:
+            return self._closed
+    
+    def publish(self, event: str, **data) -> int:
+        """Publish an event to all subscribers.
+        
+        Args:
+            event: The event type
+            **data: JSON-serialisable event data
+        
+        Returns:
+            The ID of the event
+        """
+        with self._condition:
+            self._last_id += 1
+            self._events.append({"id": self._last_id, "event": event, "time": time.time(), "data": data})
+            self._condition.notify_all()
+            return self._last_id
+    
+    def close(self):
+        """Mark the run as finished and wake all subscribers so they can disconnect."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+    
+    def events_since(self, after: int = 0) -> List[Dict[str, Any]]:
+        """Get the events with an ID greater than after that are still in the history."""
+        with self._condition:
+            return [event for event in self._events if event["id"] > after]
+    
+    def subscribe(self, after: int = 0, heartbeat: float = HEARTBEAT_INTERVAL) -> Iterator[Optional[List[Dict[str, Any]]]]:
+        """Wait for events, yielding them in batches until the bus is closed.
+        
+        Args:
+            after: Only yield events with an ID greater than this
+            heartbeat: Yield None after this many seconds without events, so callers
+                can detect disconnected clients
+        """
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._last_id > after or self._closed, timeout=heartbeat)
+                events = [event for event in self._events if event["id"] > after]
+                closed = self._closed
+            
+            if events:
+                after = events[-1]["id"]
+                yield events
+            elif closed:
+                return
+            else:
+                yield None
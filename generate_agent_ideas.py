@@ -13,37 +13,50 @@ import re
 import time
 import argparse
 from datetime import datetime
-import hashlib
 from typing import List, Dict, Optional, Tuple, Any
-import difflib
 import json
 import gc
 import signal
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # Check if required packages are installed, if not install them
 try:
     import requests
-    import jinja2
 except ImportError:
     import subprocess
     print("Installing required packages...")
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "requests", "jinja2"])
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "requests"])
     import requests
-    import jinja2
+
+from ollama_client import get_ollama_client, parse_keep_alive, response_stats, OllamaError, REQUEST_TIMEOUT
+from similarity_index import (
+    get_idea_index, get_idea_indexes, SIMILARITY_BACKENDS, DEFAULT_SIMILARITY_BACKEND
+)
+from semantic_dedup import get_semantic_deduplicator, SEMANTIC_DEDUP_AVAILABLE, DEFAULT_EMBEDDING_MODEL
+from idea_store import get_idea_store, extract_description
+from run_journal import RunJournal
+from metrics import get_metrics, span, IDEAS_TOTAL, REQUEST_SECONDS, TOKENS_TOTAL, CONCURRENCY_LIMIT, RETRIES_TOTAL
+from concurrency_controller import AdaptiveConcurrencyController
+from retry_policy import get_retry_policy, is_client_error, CircuitOpenError
+import prompt_builder
+from prompt_builder import (
+    get_prompt_builder, available_templates, DEFAULT_TEMPLATE, PROMPT_LAYOUTS, DEFAULT_PROMPT_LAYOUT
+)
 
 # Constants
 REPO_PATH = os.path.dirname(os.path.abspath(__file__))
 CATEGORIES_FILE = os.path.join(REPO_PATH, "categories.txt")
-TEMPLATE_FILE = os.path.join(REPO_PATH, "templates", "template.md")
 CATEGORIES_DIR = os.path.join(REPO_PATH, "by-category")
 INDEX_FILE = os.path.join(REPO_PATH, "index.md")
+INDEX_LEDGER_FILE = os.path.join(REPO_PATH, "index.jsonl")  # Append-only log that index.md is rendered from
 DEFAULT_MODEL = "llama3.2"  # Default to llama3.2
-OLLAMA_API_URL = "http://localhost:11434/api/generate"
-MAX_RETRIES = 3  # Maximum number of retries for failed generations
-RETRY_DELAY = 2  # Delay between retries in seconds
-REQUEST_TIMEOUT = 60  # Timeout for Ollama API requests in seconds
 INDEX_LOCK = threading.Lock()  # Lock for thread-safe index updates
+DEFAULT_CONCURRENCY = 1  # Number of in-flight Ollama requests
+SLOT_WAIT_INTERVAL = 0.5  # Seconds between stop checks while waiting for a shared request slot
+MAX_CONSECUTIVE_ERRORS = 10  # Failed requests in a row, with no idea generated or skipped, that end a run
+CREATIVITY_LEVELS = ["basic", "moderate", "creative", "highly_creative"]
 
 def load_categories() -> List[str]:
     """Load categories from the categories file."""
@@ -55,12 +68,14 @@ def load_categories() -> List[str]:
         print_error(f"Error loading categories: {str(e)}")
         return []
 
-def load_template() -> str:
-    """Load the template for AI agent ideas."""
+def load_template(name: Optional[str] = None) -> str:
+    """Load the template for AI agent ideas.
+    
+    Args:
+        name: File name of the template in the templates folder (None for template.md)
+    """
     try:
-        with open(TEMPLATE_FILE, 'r') as f:
-            template = f.read()
-        return template
+        return prompt_builder.load_template(name)
     except Exception as e:
         print_error(f"Error loading template: {str(e)}")
         return "## Error: Template could not be loaded\n\nPlease check the template file."
@@ -70,133 +85,127 @@ def get_category_folder_name(category: str) -> str:
     # Convert spaces to hyphens and make lowercase
     return category.lower().replace(' ', '-')
 
-def get_existing_ideas(category_folder: str) -> List[str]:
-    """Get a list of existing ideas in the category folder."""
-    ideas = []
-    if os.path.exists(category_folder):
-        try:
-            for filename in os.listdir(category_folder):
-                if filename.endswith('.md') and filename != 'prompt.md':
-                    file_path = os.path.join(category_folder, filename)
-                    try:
-                        with open(file_path, 'r') as f:
-                            ideas.append(f.read())
-                    except Exception as e:
-                        print_error(f"Error reading file {file_path}: {str(e)}")
-        except Exception as e:
-            print_error(f"Error listing directory {category_folder}: {str(e)}")
-    return ideas
-
-def is_similar_idea(new_idea: str, existing_ideas: List[str], threshold: float = 0.8) -> bool:
-    """Check if the new idea is similar to any existing ideas."""
-    for idea in existing_ideas:
-        try:
-            # Extract the assistant name and description for comparison
-            new_name_match = re.search(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n', new_idea)
-            existing_name_match = re.search(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n', idea)
-            
-            new_desc_match = re.search(r'## 2\. Short Description:\s*\n\s*(.+?)\s*\n', new_idea)
-            existing_desc_match = re.search(r'## 2\. Short Description:\s*\n\s*(.+?)\s*\n', idea)
-            
-            if new_name_match and existing_name_match:
-                new_name = new_name_match.group(1)
-                existing_name = existing_name_match.group(1)
-                
-                # Check name similarity
-                name_similarity = difflib.SequenceMatcher(None, new_name, existing_name).ratio()
-                if name_similarity > threshold:
-                    return True
-            
-            if new_desc_match and existing_desc_match:
-                new_desc = new_desc_match.group(1)
-                existing_desc = existing_desc_match.group(1)
-                
-                # Check description similarity
-                desc_similarity = difflib.SequenceMatcher(None, new_desc, existing_desc).ratio()
-                if desc_similarity > threshold:
-                    return True
-        except Exception as e:
-            # If there's an error in comparison, log it but continue
-            print_error(f"Error comparing ideas: {str(e)}")
-            continue
-    
-    return False
-
-def create_idea_prompt(category: str, template: str, creativity_level: str = None) -> str:
+def create_idea_prompt(category: str, template: str, creativity_level: str = None,
+                       layout: str = DEFAULT_PROMPT_LAYOUT) -> str:
     """Create a prompt for generating AI agent ideas using Jinja2 templating.
     
     Args:
         category: The category for which to generate an idea
         template: The template to use for the idea
         creativity_level: The creativity level to use (None for random selection)
+        layout: The prompt layout (see prompt_builder.PROMPT_LAYOUTS)
     """
     try:
         # If no creativity level is specified, randomly select one
         if creativity_level is None:
-            creativity_levels = ["basic", "moderate", "creative", "highly_creative"]
-            creativity_level = random.choice(creativity_levels)
-        
-        # Create Jinja2 template environment
-        env = jinja2.Environment(
-            loader=jinja2.BaseLoader(),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
-        
-        # Define creativity-specific instructions
-        creativity_instructions = {
-            "basic": "Create a straightforward, practical, and conventional assistant idea. Focus on solving a common problem in a reliable way without being particularly novel or imaginative.",
-            "moderate": "Create a somewhat creative assistant idea that improves upon existing solutions with some innovative elements.",
-            "creative": "Create an original and imaginative assistant idea that approaches the problem in a novel way.",
-            "highly_creative": "Create an extremely innovative, even quirky or unconventional assistant idea that reimagines how this category could be approached. Don't be afraid to be ambitious, surprising, or even slightly humorous."
-        }
+            creativity_level = random.choice(CREATIVITY_LEVELS)
         
-        # Define the prompt template
-        prompt_template = env.from_string("""
-You are an AI Agent Ideation Assistant. Your task is to generate a {{ creativity_level }} idea for an AI assistant within the category: {{ category }}.
-
-CREATIVITY LEVEL: {{ creativity_level }}
-{{ creativity_instructions }}
-
-IMPORTANT: Do NOT create a generic assistant that covers the entire category. Instead, focus on a very specific niche, use case, or problem within that category.
-
-For example:
-- Instead of a general "Cooking Assistant", create something like "SousVide Master" - an assistant specifically for sous vide cooking techniques
-- Instead of a general "Productivity Assistant", create something like "Meeting Summarizer Pro" - an assistant that specifically creates actionable summaries from meeting transcripts
-- Instead of a general "Travel Assistant", create something like "Solo Female Traveler Safety Guide" - an assistant focused on safety tips for women traveling alone
-
-Your idea should be:
-1. Highly specific and focused on a particular niche within the category
-2. Original and creative - not an obvious or common assistant concept
-3. Practical and solve a real problem for users
-4. Have a catchy, memorable name that clearly indicates its specific purpose
-
-Here's the template to fill out:
-
-{{ template }}
-
-Generate a complete, detailed, and creative AI assistant idea for a specific niche within the {{ category }} category. Be specific, original, and provide concrete examples.
-""")
-        
-        # Render the template with the provided variables
-        return prompt_template.render(
-            category=category, 
-            template=template, 
-            creativity_level=creativity_level.replace('_', ' '),
-            creativity_instructions=creativity_instructions[creativity_level]
-        )
+        # The compiled prompt and rendered prompts are cached by the builder
+        return get_prompt_builder(template).build(category, creativity_level, layout)
     except Exception as e:
         print_error(f"Error creating prompt: {str(e)}")
         return f"Error creating prompt: {str(e)}"
 
-def generate_idea_with_ollama(category: str, model: str, template: str, creativity_level: str = None) -> Tuple[str, str]:
+class DuplicateIdeaError(Exception):
+    """Raised when a streamed idea is aborted because it duplicates an existing idea."""
+    
+    def __init__(self, partial_idea: str):
+        super().__init__("Generation aborted: similar idea already exists")
+        self.partial_idea = partial_idea
+
+def stream_idea_with_ollama(model: str, prompt: str, options: Dict[str, Any], should_abort=None,
+                            system: Optional[str] = None, keep_alive=None) -> Tuple[str, Dict[str, Any]]:
+    """Generate an idea with Ollama's token stream, aborting early on duplicates.
+    
+    Args:
+        model: The model to use for generation
+        prompt: The prompt to send
+        options: The generation options
+        should_abort: Callable that receives the text generated so far as soon as the
+            assistant name and short description are complete; returning True cancels
+            the request and raises DuplicateIdeaError
+        system: The system prompt (None for the model's default)
+        keep_alive: How long Ollama keeps the model loaded after the request
+    
+    Returns:
+        The generated text and the token counts and durations of the final chunk
+    
+    Raises:
+        OllamaError: If Ollama reports an error mid-stream or the stream ends before
+            the final chunk, so a truncated idea is never returned
+    """
+    chunks = []
+    stats = None
+    checked = should_abort is None
+    stream = get_ollama_client().generate_stream(model, prompt, options=options, timeout=REQUEST_TIMEOUT,
+                                                 system=system, keep_alive=keep_alive)
+    try:
+        for chunk in stream:
+            if chunk.get("error"):
+                # Ollama reports failures after the 200 status line as an error chunk
+                raise OllamaError(500, chunk["error"])
+            chunks.append(chunk.get("response", ""))
+            
+            if not checked:
+                text = "".join(chunks)
+                if (re.search(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n', text) and
+                        re.search(r'## 2\. Short Description:\s*\n\s*(.+?)\s*\n', text)):
+                    checked = True
+                    if should_abort(text):
+                        raise DuplicateIdeaError(text)
+            
+            if chunk.get("done"):
+                stats = response_stats(chunk)
+                break
+    finally:
+        # Closing the stream drops the connection, which cancels generation on the server
+        stream.close()
+    
+    if stats is None:
+        raise OllamaError(500, "Stream ended before the response was complete")
+    return "".join(chunks), stats
+
+def describe_request_error(error: Exception) -> str:
+    """Get a short, readable description of a failed Ollama request."""
+    if isinstance(error, requests.exceptions.Timeout):
+        return f"Timeout error: Request to Ollama timed out after {REQUEST_TIMEOUT} seconds"
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return "Connection error: Could not connect to Ollama"
+    if isinstance(error, OllamaError):
+        return f"Ollama API error: {error.status_code} - {error.message}"
+    return str(error)
+
+def generate_idea_with_ollama(category: str, model: str, template: str, creativity_level: str = None,
+                              stream: bool = False, should_abort=None,
+                              prompt_layout: str = DEFAULT_PROMPT_LAYOUT,
+                              keep_alive=None, stop_event: Optional[threading.Event] = None
+                              ) -> Tuple[str, str, Dict[str, Any]]:
     """Generate an AI agent idea using Ollama API with retry logic.
     
+    Transient failures are retried by the shared retry policy (see retry_policy).
+    Failures that remain are raised rather than turned into a placeholder idea.
+    
     Args:
         category: The category for which to generate an idea
         model: The model to use for generation
         template: The template to use for the idea
         creativity_level: The creativity level to use (None for random selection)
+        stream: Consume Ollama's token stream instead of waiting for the whole response
+        should_abort: In streaming mode, duplicate check run on the name and short
+            description as soon as they are generated (see stream_idea_with_ollama)
+        prompt_layout: "classic", or "prefix"/"system" to send the shared instructions
+            first (or as the system prompt) so Ollama can reuse their cached prefix
+        keep_alive: How long Ollama keeps the model loaded after the request
+            (None for the server default)
+        stop_event: Event that cancels any remaining retries when set
+    
+    Returns:
+        The idea, its file name, and the model, creativity level, token counts and
+        durations of the request (see ollama_client.RESPONSE_STATS_FIELDS)
+    
+    Raises:
+        CircuitOpenError: If Ollama has failed repeatedly and is presumed down
+        DuplicateIdeaError: If a streamed idea was aborted as a duplicate
     """
     # If no creativity level is specified, randomly select one
     if creativity_level is None:
@@ -231,148 +240,156 @@ def generate_idea_with_ollama(category: str, model: str, template: str, creativi
     frequency_penalty = frequency_penalty_settings[creativity_level]
     presence_penalty = presence_penalty_settings[creativity_level]
     
-    prompt = create_idea_prompt(category, template, creativity_level)
+    with span("prompt"):
+        prompt = create_idea_prompt(category, template, creativity_level, prompt_layout)
+        system = get_prompt_builder(template).system(prompt_layout)
+    
+    options = {
+        "temperature": temperature,
+        "top_p": 0.92,
+        "frequency_penalty": frequency_penalty,
+        "presence_penalty": presence_penalty
+    }
     
-    # Try multiple times in case of failure
-    for attempt in range(MAX_RETRIES):
+    def request() -> Tuple[str, Dict[str, Any]]:
+        if stream:
+            generated_text, stats = stream_idea_with_ollama(model, prompt, options, should_abort,
+                                                            system=system, keep_alive=keep_alive)
+            return generated_text.strip(), stats
+        response = get_ollama_client().generate(model, prompt, options=options, timeout=REQUEST_TIMEOUT,
+                                                system=system, keep_alive=keep_alive)
+        return response["response"].strip(), response_stats(response)
+    
+    def on_retry(retry: int, delay: float, error: Exception):
+        get_metrics().inc(RETRIES_TOTAL, model=model)
+        print_error(f"Ollama request failed ({describe_request_error(error)}), "
+                    f"retry {retry} for {category} in {delay:.1f}s")
+    
+    # Transient failures are retried by the shared policy; anything else is raised to the caller
+    with span("request"):
         try:
-            response = requests.post(
-                OLLAMA_API_URL,
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": temperature,
-                        "top_p": 0.92,
-                        "frequency_penalty": frequency_penalty,
-                        "presence_penalty": presence_penalty
-                    }
-                },
-                timeout=REQUEST_TIMEOUT
-            )
-            
-            if response.status_code != 200:
-                if attempt < MAX_RETRIES - 1:
-                    print_error(f"Ollama API error (attempt {attempt+1}/{MAX_RETRIES}): {response.status_code} - {response.text}")
-                    time.sleep(RETRY_DELAY)
-                    continue
-                else:
-                    raise Exception(f"Ollama API error: {response.status_code} - {response.text}")
-            
-            generated_text = response.json()["response"].strip()
-            
-            # Extract assistant name for the filename
-            name_match = re.search(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n', generated_text)
-            if name_match:
-                assistant_name = name_match.group(1).strip()
-            else:
-                # If name not found, generate a random name based on category
-                assistant_name = f"{category}-Specialized-Assistant"
-            
-            # Create a filename-friendly version of the assistant name
-            filename = assistant_name.lower().replace(' ', '-').replace('/', '-').replace('\\', '-')
-            filename = re.sub(r'[^\w\-]', '', filename)
-            
-            return generated_text, filename
-            
-        except requests.exceptions.Timeout:
-            if attempt < MAX_RETRIES - 1:
-                print_error(f"Timeout error (attempt {attempt+1}/{MAX_RETRIES}): Request to Ollama timed out after {REQUEST_TIMEOUT} seconds")
-                time.sleep(RETRY_DELAY)
-            else:
-                raise Exception(f"Timeout error: Request to Ollama timed out after {REQUEST_TIMEOUT} seconds")
-        except requests.exceptions.ConnectionError:
-            if attempt < MAX_RETRIES - 1:
-                print_error(f"Connection error (attempt {attempt+1}/{MAX_RETRIES}): Could not connect to Ollama")
-                time.sleep(RETRY_DELAY)
-            else:
-                raise Exception("Connection error: Could not connect to Ollama")
-        except Exception as e:
-            if attempt < MAX_RETRIES - 1:
-                print_error(f"Error (attempt {attempt+1}/{MAX_RETRIES}): {str(e)}")
-                time.sleep(RETRY_DELAY)
-            else:
-                print_error(f"Error generating idea with Ollama: {e}")
-                # Fallback to a simple template with error message
-                return f"## 1. Assistant Name:\n\n{category} Assistant (Error)\n\n## 2. Short Description:\n\nError generating idea: {str(e)}\n", f"{category.lower()}-assistant-error"
+            generated_text, stats = get_retry_policy().call(request, stop_event, on_retry)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            raise Exception(describe_request_error(e)) from e
+    
+    if not generated_text:
+        raise ValueError("Ollama returned an empty response")
+    
+    # Extract assistant name for the filename
+    name_match = re.search(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n', generated_text)
+    if name_match:
+        assistant_name = name_match.group(1).strip()
+    else:
+        # If name not found, generate a random name based on category
+        assistant_name = f"{category}-Specialized-Assistant"
+    
+    # Create a filename-friendly version of the assistant name
+    filename = assistant_name.lower().replace(' ', '-').replace('/', '-').replace('\\', '-')
+    filename = re.sub(r'[^\w\-]', '', filename)
+    
+    return generated_text, filename, {"model": model, "creativity_level": creativity_level, **stats}
+
+INDEX_HEADER = (
+    "# AI Agent Ideas Index\n\n"
+    "This page provides a chronological index of all generated AI agent ideas, with the newest ideas listed first.\n\n"
+    "| Date Generated | Assistant Name | Category | Link |\n"
+    "|----------------|----------------|----------|------|\n"
+)
+INDEX_ROW_PATTERN = re.compile(r'^\|\s*(.*?)\s*\|\s*(.*?)\s*\|\s*(.*?)\s*\|\s*\[.*?\]\((.*?)\)\s*\|\s*$')
+
+def _read_index_rows() -> List[Dict[str, str]]:
+    """Read the rows of index.md, oldest first (empty if there is no index.md)."""
+    entries = []
+    if os.path.exists(INDEX_FILE):
+        with open(INDEX_FILE, 'r') as f:
+            for line in f:
+                match = INDEX_ROW_PATTERN.match(line)
+                if match and match.group(1) != "Date Generated":
+                    date, name, category, path = match.groups()
+                    entries.append({"date": date, "name": name, "category": category, "path": path})
     
-    # If we get here, all attempts failed
-    return f"## 1. Assistant Name:\n\n{category} Assistant (Error)\n\n## 2. Short Description:\n\nError generating idea after {MAX_RETRIES} attempts\n", f"{category.lower()}-assistant-error"
+    # index.md lists the newest ideas first, the ledger is in generation order
+    entries.reverse()
+    return entries
+
+def _seed_index_ledger():
+    """Create the index ledger, importing the rows of an existing index.md (call with INDEX_LOCK held)."""
+    with open(INDEX_LEDGER_FILE, 'w') as f:
+        for entry in _read_index_rows():
+            f.write(json.dumps(entry) + "\n")
 
 def update_index(assistant_name: str, category: str, file_path: str) -> bool:
-    """Update the index.md file with a new idea entry."""
+    """Append a new idea entry to the index ledger.
+    
+    index.md itself is regenerated from the ledger by render_index(), which the
+    generation engine calls once at the end of each batch.
+    """
     try:
-        # Use a lock to prevent multiple threads from updating the index simultaneously
+        entry = {
+            "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "name": assistant_name,
+            "category": category,
+            "path": os.path.relpath(file_path, REPO_PATH)
+        }
+        
+        # Use a lock to prevent multiple threads from writing the ledger simultaneously
         with INDEX_LOCK:
-            # Create the index file if it doesn't exist
-            if not os.path.exists(INDEX_FILE):
-                with open(INDEX_FILE, 'w') as f:
-                    f.write("# AI Agent Ideas Index\n\n")
-                    f.write("This page provides a chronological index of all generated AI agent ideas, with the newest ideas listed first.\n\n")
-                    f.write("| Date Generated | Assistant Name | Category | Link |\n")
-                    f.write("|----------------|----------------|----------|------|\n")
-            
-            # Get the current date and time
-            current_datetime = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Create a relative path for the link
-            relative_path = os.path.relpath(file_path, REPO_PATH)
+            if not os.path.exists(INDEX_LEDGER_FILE):
+                _seed_index_ledger()
             
-            # Create the new row for the table
-            new_row = f"| {current_datetime} | {assistant_name} | {category} | [{assistant_name}]({relative_path}) |\n"
-            
-            # Read the existing content
-            with open(INDEX_FILE, 'r') as f:
-                content = f.readlines()
-            
-            # Check if the table header is correctly formatted
-            header_line_index = None
-            separator_line_index = None
-            
-            for i, line in enumerate(content):
-                if "| Date Generated | Assistant Name | Category | Link |" in line:
-                    header_line_index = i
-                if "|----------------|----------------|----------|------|" in line:
-                    separator_line_index = i
-                elif "|----------------|----------------|----------|------||" in line:
-                    # Fix malformed separator line
-                    content[i] = "|----------------|----------------|----------|------|\n"
-                    separator_line_index = i
+            with open(INDEX_LEDGER_FILE, 'a') as f:
+                f.write(json.dumps(entry) + "\n")
+        
+        return True
+    except Exception as e:
+        print_error(f"Error updating index: {str(e)}")
+        return False
+
+def render_index() -> bool:
+    """Regenerate index.md from the index ledger, newest ideas first.
+    
+    Rows of the current index.md that the ledger lacks are added to the ledger first,
+    so rendering never drops them.
+    """
+    try:
+        with INDEX_LOCK:
+            if not os.path.exists(INDEX_LEDGER_FILE):
+                _seed_index_ledger()
             
-            # If header exists but separator is missing or incorrect, fix it
-            if header_line_index is not None and (separator_line_index is None or separator_line_index != header_line_index + 1):
-                if separator_line_index is not None:
-                    content.pop(separator_line_index)
-                content.insert(header_line_index + 1, "|----------------|----------------|----------|------|\n")
-                separator_line_index = header_line_index + 1
+            entries = []
+            with open(INDEX_LEDGER_FILE, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        # Skip a partially written last line
+                        continue
             
-            # Find the position to insert the new row (after the table header)
-            insert_position = 0
-            if separator_line_index is not None:
-                insert_position = separator_line_index + 1
-            else:
-                # If we can't find the separator line, look for any line starting with "|----"
-                for i, line in enumerate(content):
-                    if line.startswith("|----"):
-                        insert_position = i + 1
-                        break
+            # The ledger is local (not committed), so keep rows that reached index.md
+            # some other way, e.g. ideas generated on another clone and pulled
+            known_paths = {entry['path'] for entry in entries}
+            missing = [entry for entry in _read_index_rows() if entry['path'] not in known_paths]
+            if missing:
+                with open(INDEX_LEDGER_FILE, 'a') as f:
+                    for entry in missing:
+                        f.write(json.dumps(entry) + "\n")
+                entries.extend(missing)
+                # Stable sort, so ideas from the same second stay in generation order
+                entries.sort(key=lambda entry: entry['date'])
             
-            # Insert the new row
-            if insert_position > 0:
-                content.insert(insert_position, new_row)
-                
-                # Write the updated content back to the file
-                with open(INDEX_FILE, 'w') as f:
-                    f.writelines(content)
-                
-                return True
-            else:
-                print_error("Could not find table header in index.md")
-                return False
-                
+            temp_file = INDEX_FILE + ".tmp"
+            with open(temp_file, 'w') as f:
+                f.write(INDEX_HEADER)
+                f.writelines(f"| {entry['date']} | {entry['name']} | {entry['category']} | "
+                             f"[{entry['name']}]({entry['path']}) |\n" for entry in reversed(entries))
+            os.replace(temp_file, INDEX_FILE)
+        
+        return True
     except Exception as e:
-        print_error(f"Error updating index: {str(e)}")
+        print_error(f"Error rendering index: {str(e)}")
         return False
 
 def save_idea(idea: str, category: str, filename: str) -> str:
@@ -398,6 +415,10 @@ def save_idea(idea: str, category: str, filename: str) -> str:
         with open(file_path, 'w') as f:
             f.write(idea)
         
+        # Keep the in-memory similarity indexes current
+        for index in get_idea_indexes():
+            index.add(category_folder, file_path, idea)
+        
         # Extract the assistant name for the index
         name_match = re.search(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n', idea)
         if name_match:
@@ -406,7 +427,8 @@ def save_idea(idea: str, category: str, filename: str) -> str:
             assistant_name = filename.replace('-', ' ').title()
         
         # Update the index with the new idea
-        update_index(assistant_name, category, file_path)
+        with span("index"):
+            update_index(assistant_name, category, file_path)
         
         return file_path
     except Exception as e:
@@ -417,12 +439,7 @@ def save_idea(idea: str, category: str, filename: str) -> str:
 def get_available_models() -> List[Dict[str, Any]]:
     """Get a list of available models from Ollama."""
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=10)
-        if response.status_code != 200:
-            print_error(f"Error getting models: {response.status_code} - {response.text}")
-            return []
-        
-        return response.json().get("models", [])
+        return get_ollama_client().list_models()
     except Exception as e:
         print_error(f"Error getting models: {str(e)}")
         return []
@@ -449,8 +466,392 @@ def print_info(text: str):
     """Print an info message."""
     print_colored(text, "\033[1;34m")  # Bold Blue
 
-def interactive_mode():
-    """Run the script in interactive mode."""
+class GenerationEngine:
+    """Generate ideas with a bounded pool of in-flight Ollama requests.
+    
+    Worker threads only talk to Ollama. Similarity checks, saving and index updates
+    happen in a single writer stage on the thread that calls run(), so idea files
+    and index.md are never written concurrently.
+    """
+    
+    def __init__(self, model: str, template: str, categories: List[str],
+                 similarity_threshold: float = 0.8, concurrency: int = DEFAULT_CONCURRENCY,
+                 specific_category: Optional[str] = None, use_creativity_distribution: bool = False,
+                 stream: bool = False, similarity_backend: str = DEFAULT_SIMILARITY_BACKEND,
+                 global_dedup: bool = False, semantic_threshold: Optional[float] = None,
+                 embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+                 stop_event: Optional[threading.Event] = None, on_event=None, limiter=None,
+                 initial_jobs: Optional[List[Tuple[str, Optional[str]]]] = None,
+                 prompt_layout: str = DEFAULT_PROMPT_LAYOUT, keep_alive=None, store=None,
+                 adaptive_concurrency: bool = False):
+        """Initialize the engine.
+        
+        Args:
+            model: The model to use for generation
+            template: The template to use for the ideas
+            categories: The categories to pick from
+            similarity_threshold: Threshold for similarity checking (0.0-1.0)
+            concurrency: Maximum number of concurrent Ollama requests
+            specific_category: Generate only for this category (None for random selection)
+            use_creativity_distribution: Pick a creativity level per idea instead of leaving it to the generator
+            stream: Stream responses and cancel requests as soon as the idea is known to be a duplicate
+            similarity_backend: Similarity backend used for duplicate checks ("difflib" or "minhash")
+            global_dedup: Check for duplicates across all categories instead of only the idea's own
+            semantic_threshold: Cosine similarity above which ideas are semantic duplicates
+                (None disables the embedding-based check)
+            embedding_model: Ollama embedding model used for the semantic check
+            stop_event: Event that stops the run once in-flight requests have finished
+            on_event: Callback called as on_event(event, data) for "started", "generated",
+                "skipped", "error" and "finished" events; the data of "generated", "skipped"
+                and "error" includes the request latency in seconds and the attempt number
+                of the matching "started" event
+            limiter: Semaphore shared with other engines that bounds their combined
+                in-flight Ollama requests (None for no shared limit)
+            initial_jobs: (category, creativity level) pairs to request before picking new ones,
+                e.g. the unfinished requests of a resumed run
+            prompt_layout: Prompt layout (see prompt_builder.PROMPT_LAYOUTS)
+            keep_alive: How long Ollama keeps the model loaded between requests
+            store: Idea store to save ideas to (defaults to the shared store of ideas.db)
+            adaptive_concurrency: Adjust the number of in-flight requests to Ollama's latency
+                and errors, up to concurrency, instead of always using concurrency
+        """
+        self.model = model
+        self.template = template
+        self.categories = categories
+        self.similarity_threshold = similarity_threshold
+        self.concurrency = max(1, concurrency)
+        self.specific_category = specific_category
+        self.use_creativity_distribution = use_creativity_distribution
+        self.stream = stream
+        self.index = get_idea_index(similarity_backend)
+        self.global_dedup = global_dedup
+        self.semantic_threshold = semantic_threshold
+        self.semantic = None
+        if semantic_threshold is not None:
+            self.semantic = get_semantic_deduplicator(CATEGORIES_DIR, embedding_model)
+        
+        # Ideas are saved to ideas.db in batches; the markdown files are a secondary export
+        self.store = store
+        if self.store is None:
+            try:
+                self.store = get_idea_store()
+            except Exception as e:
+                print_error(f"Error opening the ideas database, saving markdown files only: {str(e)}")
+        self.stop_event = stop_event or threading.Event()
+        self.on_event = on_event
+        self.limiter = limiter
+        self.initial_jobs = deque(initial_jobs or [])
+        self.prompt_layout = prompt_layout
+        self.keep_alive = keep_alive
+        self.controller = AdaptiveConcurrencyController(self.concurrency) if adaptive_concurrency else None
+        self.stats = {"attempts": 0, "generated": 0, "skipped": 0, "errors": 0}
+        self.failure: Optional[str] = None  # Why the run was cut short, e.g. Ollama is down
+        self._consecutive_errors = 0
+        self._resume_at = 0.0  # Monotonic time before which no new request is sent after an error
+    
+    @property
+    def in_flight_limit(self) -> int:
+        """The number of requests that may be in flight now."""
+        return self.controller.limit if self.controller is not None else self.concurrency
+    
+    def _record_outcome(self, latency: float, error: Optional[Exception] = None):
+        """Feed a finished request to the adaptive concurrency controller, if any."""
+        if self.controller is None:
+            return
+        if error is None:
+            self.controller.on_success(latency)
+        elif not is_client_error(error):
+            # Client errors such as an unknown model say nothing about server load
+            self.controller.on_failure()
+        get_metrics().set(CONCURRENCY_LIMIT, self.controller.limit, model=self.model)
+    
+    def _record_error(self, category: str, creativity_level: Optional[str], latency: float, attempt: int,
+                      error: str, fatal: bool = False):
+        """Count a failed request, back off before the next one, and end the run if errors persist.
+        
+        Args:
+            error: Description of the error, reported with the "error" event
+            fatal: End the run now, e.g. because Ollama rejected the request itself
+        """
+        self.stats["errors"] += 1
+        self._consecutive_errors += 1
+        if fatal:
+            self.failure = error
+        elif self._consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+            self.failure = f"{self._consecutive_errors} requests in a row failed (last error: {error})"
+        self._resume_at = time.monotonic() + get_retry_policy().backoff(self._consecutive_errors)
+        self._emit("error", category=category, creativity_level=creativity_level, latency=latency,
+                   attempt=attempt, error=error)
+    
+    def _record_progress(self):
+        """Note that a request produced an idea (saved or skipped), so errors are no longer in a row."""
+        self._consecutive_errors = 0
+        self._resume_at = 0.0
+    
+    def _emit(self, event: str, **data):
+        """Count an event in the metrics and send it to the callback, if any."""
+        if event in ("generated", "skipped", "error"):
+            metrics = get_metrics()
+            metrics.inc(IDEAS_TOTAL, outcome=event, category=data["category"], model=self.model)
+            if data.get("latency") is not None:
+                metrics.observe(REQUEST_SECONDS, data["latency"], model=self.model)
+        
+        if self.on_event is None:
+            return
+        try:
+            self.on_event(event, data)
+        except Exception as e:
+            print_error(f"Error in generation event handler: {str(e)}")
+    
+    def _next_job(self) -> Tuple[str, Optional[str]]:
+        """Pick the category and creativity level for the next request."""
+        if self.initial_jobs:
+            return self.initial_jobs.popleft()
+        category = self.specific_category or random.choice(self.categories)
+        creativity_level = random.choice(CREATIVITY_LEVELS) if self.use_creativity_distribution else None
+        return category, creativity_level
+    
+    def _is_duplicate(self, category: str, idea: str) -> bool:
+        """Check whether an idea (possibly partial) is similar to an existing idea."""
+        with span("similarity"):
+            if self.global_dedup:
+                return self.index.is_similar_in_any(CATEGORIES_DIR, idea, self.similarity_threshold)
+            category_folder = os.path.join(CATEGORIES_DIR, get_category_folder_name(category))
+            return self.index.is_similar(category_folder, idea, self.similarity_threshold)
+    
+    def _semantic_folder(self, category: str) -> Optional[str]:
+        """Get the folder the semantic check compares against (None for all categories)."""
+        return None if self.global_dedup else get_category_folder_name(category)
+    
+    def _generate(self, category: str, creativity_level: Optional[str]) -> Tuple[str, str, Any, Dict[str, Any]]:
+        """Worker stage: request one idea from Ollama (and its embedding, if semantic checks are on)."""
+        if self.stream:
+            idea, filename, stats = generate_idea_with_ollama(
+                category, self.model, self.template, creativity_level, stream=True,
+                should_abort=lambda partial_idea: self._is_duplicate(category, partial_idea),
+                prompt_layout=self.prompt_layout, keep_alive=self.keep_alive, stop_event=self.stop_event
+            )
+        else:
+            idea, filename, stats = generate_idea_with_ollama(category, self.model, self.template, creativity_level,
+                                                              prompt_layout=self.prompt_layout,
+                                                              keep_alive=self.keep_alive, stop_event=self.stop_event)
+        
+        vector = None
+        if self.semantic is not None:
+            with span("embed"):
+                vector = self.semantic.embed(idea)
+                # Embed any existing ideas missing from the store here rather than in the writer stage
+                self.semantic.prepare(self._semantic_folder(category))
+        
+        return idea, filename, vector, stats
+    
+    def _write(self, category: str, creativity_level: Optional[str], idea: str, filename: str, vector=None,
+               latency: Optional[float] = None, attempt: Optional[int] = None,
+               stats: Optional[Dict[str, Any]] = None):
+        """Writer stage: check similarity and save the idea.
+        
+        Args:
+            latency: Seconds the worker stage took, reported with the resulting event
+            attempt: Attempt number of the request, reported with the resulting event
+            stats: Ollama's token counts and durations for the request, saved with the idea
+        """
+        # Checked again here even when streaming, since ideas saved by other
+        # in-flight requests were not on disk when the early check ran
+        if self._is_duplicate(category, idea):
+            self.stats["skipped"] += 1
+            self._emit("skipped", category=category, creativity_level=creativity_level, latency=latency,
+                       attempt=attempt)
+            return
+        
+        if vector is not None:
+            with span("semantic"):
+                is_duplicate = self.semantic.is_duplicate(vector, self.semantic_threshold,
+                                                          self._semantic_folder(category))
+        else:
+            is_duplicate = False
+        if is_duplicate:
+            self.stats["skipped"] += 1
+            self._emit("skipped", category=category, creativity_level=creativity_level, latency=latency,
+                       attempt=attempt, semantic=True)
+            return
+        
+        with span("save"):
+            file_path = save_idea(idea, category, filename)
+        if vector is not None:
+            self.semantic.add(file_path, vector)
+        
+        name_match = re.search(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n', idea)
+        assistant_name = name_match.group(1).strip() if name_match else filename.replace('-', ' ').title()
+        
+        if self.store is not None:
+            try:
+                with span("store"):
+                    self.store.add(assistant_name, extract_description(idea), category,
+                                   os.path.relpath(file_path, REPO_PATH), idea, generation_stats=stats)
+            except Exception as e:
+                # The idea file is already written, so the idea still counts as generated
+                print_error(f"Error adding idea to the database: {str(e)}")
+        
+        self.stats["generated"] += 1
+        self._emit("generated", name=assistant_name, category=category, file_path=file_path,
+                   creativity_level=creativity_level, idea=idea, latency=latency, attempt=attempt)
+    
+    def _count_tokens(self, stats: Dict[str, Any]):
+        """Add the prompt and generated tokens of a request to the token counters."""
+        metrics = get_metrics()
+        for phase, field in (("prompt", "prompt_eval_count"), ("eval", "eval_count")):
+            if stats.get(field):
+                metrics.inc(TOKENS_TOTAL, stats[field], phase=phase, model=self.model)
+    
+    def _acquire_slot(self, block: bool) -> bool:
+        """Take a request slot from the shared limiter, if any.
+        
+        Args:
+            block: Wait briefly for a slot instead of giving up at once
+        """
+        if self.limiter is None:
+            return True
+        if block:
+            return self.limiter.acquire(timeout=SLOT_WAIT_INTERVAL)
+        return self.limiter.acquire(blocking=False)
+    
+    def run(self, num_ideas: int, unlimited: bool = False) -> Dict[str, int]:
+        """Generate ideas until num_ideas have been saved (or forever if unlimited) or the run is stopped.
+        
+        After a failed request no new one is sent for a jittered, growing backoff. The
+        run ends early, with the reason left in self.failure, if the retry policy's circuit
+        breaker opens, if Ollama rejects a request itself (e.g. an unknown model) or after
+        MAX_CONSECUTIVE_ERRORS failed requests in a row.
+        
+        Returns:
+            The run statistics (attempts, generated, skipped, errors)
+        """
+        pending = {}
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="ollama") as executor:
+            while True:
+                waiting_for_slot = False
+                
+                # Keep the pool full, but never request more ideas than are still needed
+                while (not self.stop_event.is_set() and self.failure is None and
+                       time.monotonic() >= self._resume_at and len(pending) < self.in_flight_limit and
+                       (unlimited or self.stats["generated"] + len(pending) < num_ideas)):
+                    # Only wait for a shared slot when nothing of ours is in flight
+                    if not self._acquire_slot(block=not pending):
+                        waiting_for_slot = True
+                        break
+                    
+                    category, creativity_level = self._next_job()
+                    self.stats["attempts"] += 1
+                    
+                    # Periodically clean up memory
+                    if self.stats["attempts"] % 50 == 0:
+                        gc.collect()
+                    
+                    self._emit("started", category=category, creativity_level=creativity_level,
+                               attempt=self.stats["attempts"])
+                    future = executor.submit(self._generate, category, creativity_level)
+                    if self.limiter is not None:
+                        future.add_done_callback(lambda _: self.limiter.release())
+                    pending[future] = (category, creativity_level, self.stats["attempts"], time.monotonic())
+                
+                if not pending:
+                    if waiting_for_slot:
+                        continue
+                    backoff = self._resume_at - time.monotonic()
+                    if (backoff > 0 and not self.stop_event.is_set() and self.failure is None and
+                            (unlimited or self.stats["generated"] < num_ideas)):
+                        # Backing off after an error; the wait ends early if the run is stopped
+                        self.stop_event.wait(backoff)
+                        continue
+                    break
+                
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    category, creativity_level, attempt, submitted = pending.pop(future)
+                    latency = time.monotonic() - submitted
+                    try:
+                        idea, filename, vector, stats = future.result()
+                    except DuplicateIdeaError:
+                        # Aborted streams are cut short, so their latency is not a load signal
+                        self._record_progress()
+                        self.stats["skipped"] += 1
+                        self._emit("skipped", category=category, creativity_level=creativity_level,
+                                   latency=latency, attempt=attempt, early=True)
+                    except CircuitOpenError as e:
+                        # Ollama is down: end the run instead of failing every remaining request
+                        self._record_error(category, creativity_level, latency, attempt, str(e), fatal=True)
+                    except Exception as e:
+                        self._record_outcome(latency, e)
+                        # A client error such as an unknown model would fail every request the same way
+                        self._record_error(category, creativity_level, latency, attempt,
+                                           describe_request_error(e), fatal=is_client_error(e))
+                    else:
+                        # Only the Ollama request feeds the controller; the writer stage is local work
+                        self._record_outcome(latency)
+                        self._count_tokens(stats)
+                        try:
+                            self._write(category, creativity_level, idea, filename, vector, latency, attempt, stats)
+                        except Exception as e:
+                            self._record_error(category, creativity_level, latency, attempt,
+                                               f"Error saving idea: {str(e)}")
+                        else:
+                            self._record_progress()
+        
+        if self.store is not None:
+            try:
+                self.store.flush()
+            except Exception as e:
+                print_error(f"Error saving ideas to the database: {str(e)}")
+        
+        if self.semantic is not None:
+            self.semantic.save()
+        
+        if self.stats["generated"] > 0:
+            with span("render_index"):
+                render_index()
+        
+        self._emit("finished", stopped=self.stop_event.is_set(), failure=self.failure, **self.stats)
+        return dict(self.stats)
+
+def print_metrics_summary(path: Optional[str] = None):
+    """Print the JSON summary of the run's stage timings and idea counters.
+    
+    Args:
+        path: File to also write the summary to (None to only print it)
+    """
+    summary = json.dumps(get_metrics().summary(), indent=2)
+    print_header("Metrics")
+    print(summary)
+    if path:
+        try:
+            with open(path, 'w') as f:
+                f.write(summary + "\n")
+            print_info(f"Metrics written to {path}")
+        except OSError as e:
+            print_error(f"Error writing metrics: {str(e)}")
+
+def interactive_mode(concurrency: int = DEFAULT_CONCURRENCY, stream: bool = False,
+                     similarity_backend: str = DEFAULT_SIMILARITY_BACKEND, global_dedup: bool = False,
+                     semantic_threshold: Optional[float] = None, embedding_model: str = DEFAULT_EMBEDDING_MODEL,
+                     metrics_json: Optional[str] = None, template_name: str = DEFAULT_TEMPLATE,
+                     prompt_layout: str = DEFAULT_PROMPT_LAYOUT, keep_alive=None,
+                     adaptive_concurrency: bool = False):
+    """Run the script in interactive mode.
+    
+    Args:
+        concurrency: Maximum number of concurrent Ollama requests
+        stream: Stream responses and abort duplicate ideas early
+        similarity_backend: Similarity backend used for duplicate checks
+        global_dedup: Check for duplicates across all categories
+        semantic_threshold: Cosine similarity for the embedding-based check (None to disable)
+        embedding_model: Ollama embedding model for the semantic check
+        metrics_json: File to also write the end-of-run metrics summary to
+        template_name: Idea template from the templates folder
+        prompt_layout: Prompt layout (see prompt_builder.PROMPT_LAYOUTS)
+        keep_alive: How long Ollama keeps the model loaded between requests
+        adaptive_concurrency: Adjust the number of in-flight requests up to concurrency
+    """
     print_header("AI Agent Ideation Generator - Interactive Mode")
     
     # Get available models
@@ -505,6 +906,8 @@ def interactive_mode():
     print_header("Starting Generation")
     print_info(f"Generating {num_ideas} ideas with model {selected_model}")
     print_info(f"Similarity threshold: {similarity_threshold}")
+    print_info(f"Concurrent requests: {'adaptive, up to ' if adaptive_concurrency else ''}{concurrency}")
+    print_info(f"Template: {template_name} ({prompt_layout} prompt layout)")
     
     # Load categories and template
     categories = load_categories()
@@ -512,7 +915,7 @@ def interactive_mode():
         print_error("No categories found. Please check the categories file.")
         return
     
-    template = load_template()
+    template = load_template(template_name)
     
     # Setup for graceful termination
     stop_event = threading.Event()
@@ -524,64 +927,40 @@ def interactive_mode():
     # Register signal handler for Ctrl+C
     signal.signal(signal.SIGINT, signal_handler)
     
+    def on_event(event: str, data: Dict[str, Any]):
+        if event == "started":
+            print_info(f"\nGenerating idea {engine.stats['generated']+1}/{num_ideas} for category: {data['category']}")
+        elif event == "skipped":
+            print_info(f"Skipped: Similar idea already exists for {data['category']}" +
+                       (" (aborted early)" if data.get('early') else " (semantic match)" if data.get('semantic') else ""))
+        elif event == "generated":
+            print_success(f"Generated: {data['name']} (Category: {data['category']})")
+            print_info(f"Saved to: {data['file_path']}")
+        elif event == "error":
+            print_error(f"Error: {data['error']}")
+    
     # Generate ideas
-    successful_generations = 0
-    attempts = 0
+    engine = GenerationEngine(selected_model, template, categories, similarity_threshold,
+                              concurrency=concurrency, stream=stream, similarity_backend=similarity_backend,
+                              global_dedup=global_dedup, semantic_threshold=semantic_threshold,
+                              embedding_model=embedding_model, stop_event=stop_event, on_event=on_event,
+                              prompt_layout=prompt_layout, keep_alive=keep_alive,
+                              adaptive_concurrency=adaptive_concurrency)
     
     try:
-        while successful_generations < num_ideas and not stop_event.is_set():
-            attempts += 1
-            
-            # Periodically clean up memory
-            if attempts % 50 == 0:
-                gc.collect()
-            
-            # Randomly select a category
-            category = random.choice(categories)
-            
-            print_info(f"\nGenerating idea {successful_generations+1}/{num_ideas} for category: {category}")
-            
-            try:
-                # Generate the idea
-                idea, filename = generate_idea_with_ollama(category, selected_model, template)
-                
-                # Check if the idea is similar to existing ideas
-                category_folder = os.path.join(CATEGORIES_DIR, get_category_folder_name(category))
-                existing_ideas = get_existing_ideas(category_folder)
-                
-                if is_similar_idea(idea, existing_ideas, similarity_threshold):
-                    print_info(f"Skipped: Similar idea already exists for {category}")
-                    continue
-                
-                # Save the idea
-                file_path = save_idea(idea, category, filename)
-                
-                # Extract the assistant name for display
-                name_match = re.search(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n', idea)
-                if name_match:
-                    assistant_name = name_match.group(1).strip()
-                    print_success(f"Generated: {assistant_name} (Category: {category})")
-                else:
-                    print_success(f"Generated idea for category: {category}")
-                
-                print_info(f"Saved to: {file_path}")
-                
-                successful_generations += 1
-                
-            except Exception as e:
-                print_error(f"Error: {str(e)}")
-                # Wait a bit before trying again
-                time.sleep(1)
-            
-            # Small delay between generations to prevent overloading Ollama
-            time.sleep(0.1)
+        stats = engine.run(num_ideas)
         
-        if stop_event.is_set():
+        if engine.failure:
+            print_error(f"Generation stopped early: {engine.failure}")
+        elif stop_event.is_set():
             print_header("Generation stopped by user")
         else:
             print_header("Generation Complete")
         
-        print_success(f"Successfully generated {successful_generations} ideas after {attempts} attempts.")
+        print_success(f"Successfully generated {stats['generated']} ideas after {stats['attempts']} attempts.")
+        if engine.controller is not None:
+            print_info(f"Concurrency settled at {engine.controller.limit} requests")
+        print_metrics_summary(metrics_json)
         
     except Exception as e:
         print_error(f"Unexpected error: {str(e)}")
@@ -595,12 +974,64 @@ def main():
     parser.add_argument("num_ideas", type=int, nargs="?", default=10, help="Number of ideas to generate")
     parser.add_argument("--model", type=str, default=DEFAULT_MODEL, help=f"Ollama model to use (default: {DEFAULT_MODEL})")
     parser.add_argument("--similarity-threshold", type=float, default=0.8, help="Threshold for similarity checking (0.0-1.0, default: 0.8)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help=f"Number of concurrent Ollama requests (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument("--adaptive-concurrency", action="store_true", help="Start with one request and adjust the number of concurrent requests to Ollama's latency and errors, up to --concurrency")
+    parser.add_argument("--similarity-backend", choices=sorted(SIMILARITY_BACKENDS), default=DEFAULT_SIMILARITY_BACKEND, help=f"Duplicate detection backend: exact pairwise difflib or MinHash/LSH candidate lookup (default: {DEFAULT_SIMILARITY_BACKEND})")
+    parser.add_argument("--global-dedup", action="store_true", help="Check for duplicate ideas across all categories, not just the idea's own category")
+    parser.add_argument("--semantic-threshold", type=float, default=None, help="Also skip ideas whose embedding has a cosine similarity above this value with an existing idea (requires numpy and an Ollama embedding model)")
+    parser.add_argument("--embedding-model", type=str, default=DEFAULT_EMBEDDING_MODEL, help=f"Ollama embedding model for --semantic-threshold (default: {DEFAULT_EMBEDDING_MODEL})")
+    parser.add_argument("--stream", action="store_true", help="Stream responses and abort duplicate ideas as soon as their name and description are generated")
     parser.add_argument("--interactive", "-i", action="store_true", help="Run in interactive mode")
+    parser.add_argument("--render-index", action="store_true", help="Regenerate index.md from the index ledger and exit")
+    parser.add_argument("--template", choices=available_templates(), default=DEFAULT_TEMPLATE, help=f"Idea template from the templates folder (default: {DEFAULT_TEMPLATE})")
+    parser.add_argument("--prompt-layout", choices=PROMPT_LAYOUTS, default=DEFAULT_PROMPT_LAYOUT, help=f"Prompt layout: classic, or prefix/system to send the shared instructions first or as the system prompt so Ollama reuses their cached prefix (default: {DEFAULT_PROMPT_LAYOUT})")
+    parser.add_argument("--keep-alive", type=str, default=None, help="How long Ollama keeps the model loaded after each request, e.g. 30m, or -1 to keep it loaded (default: server setting)")
+    parser.add_argument("--metrics-json", type=str, default=None, metavar="FILE", help="Also write the end-of-run metrics summary to a JSON file")
+    parser.add_argument("--resume", type=str, metavar="RUN_ID", help="Resume an interrupted batch run with the settings it was started with")
     
     args = parser.parse_args()
     
-    if args.interactive:
-        interactive_mode()
+    if args.render_index:
+        if render_index():
+            print_success(f"Rendered {INDEX_FILE}")
+        return
+    
+    if args.concurrency <= 0:
+        print_error("Concurrency must be positive")
+        return
+    
+    if args.semantic_threshold is not None:
+        if not (0.0 <= args.semantic_threshold <= 1.0):
+            print_error("Semantic threshold must be between 0.0 and 1.0")
+            return
+        if not SEMANTIC_DEDUP_AVAILABLE:
+            print_error("Semantic deduplication requires numpy. Install it with: pip install numpy")
+            return
+    
+    # A resumed run continues with the settings it was started with
+    journal = None
+    if args.resume:
+        try:
+            journal = RunJournal.load(args.resume)
+        except FileNotFoundError:
+            print_error(f"No run found with ID {args.resume}")
+            return
+        except Exception as e:
+            print_error(f"Error loading run {args.resume}: {str(e)}")
+            return
+        
+        if journal.completed or journal.remaining == 0:
+            print_info(f"Run {journal.run_id} is already complete ({journal.generated}/{journal.target} ideas)")
+            return
+        
+        for key, value in journal.params.items():
+            setattr(args, key, value)
+        args.num_ideas = journal.remaining
+    
+    if args.interactive and journal is None:
+        interactive_mode(args.concurrency, args.stream, args.similarity_backend, args.global_dedup,
+                         args.semantic_threshold, args.embedding_model, args.metrics_json, args.template,
+                         args.prompt_layout, parse_keep_alive(args.keep_alive), args.adaptive_concurrency)
         return
     
     # Non-interactive mode
@@ -617,16 +1048,15 @@ def main():
     
     # Check if Ollama is available
     try:
-        response = requests.get("http://localhost:11434/api/tags", timeout=5)
-        if response.status_code != 200:
-            print_error("Error: Ollama is not available. Make sure it's running.")
-            return
+        models = get_ollama_client().list_models(timeout=5)
+    except OllamaError:
+        print_error("Error: Ollama is not available. Make sure it's running.")
+        return
     except Exception as e:
         print_error(f"Error connecting to Ollama: {str(e)}")
         return
     
     # Check if the model exists
-    models = get_available_models()
     model_names = [model.get("name") for model in models]
     
     if args.model not in model_names:
@@ -636,9 +1066,31 @@ def main():
             print(f"- {model_name}")
         return
     
+    if journal is None:
+        journal = RunJournal.create({
+            "model": args.model,
+            "similarity_threshold": args.similarity_threshold,
+            "concurrency": args.concurrency,
+            "adaptive_concurrency": args.adaptive_concurrency,
+            "similarity_backend": args.similarity_backend,
+            "global_dedup": args.global_dedup,
+            "semantic_threshold": args.semantic_threshold,
+            "embedding_model": args.embedding_model,
+            "stream": args.stream,
+            "template": args.template,
+            "prompt_layout": args.prompt_layout,
+            "keep_alive": args.keep_alive
+        }, args.num_ideas)
+        print_info(f"Run ID: {journal.run_id} (continue an interrupted run with --resume {journal.run_id})")
+    else:
+        print_info(f"Resuming run {journal.run_id}: {journal.generated}/{journal.target} ideas already generated")
+    
     print_info(f"Using model: {args.model}")
     print_info(f"Generating {args.num_ideas} ideas")
-    print_info(f"Similarity threshold: {args.similarity_threshold}")
+    print_info(f"Similarity threshold: {args.similarity_threshold} ({args.similarity_backend}"
+               f"{', all categories' if args.global_dedup else ''})")
+    print_info(f"Concurrent requests: {'adaptive, up to ' if args.adaptive_concurrency else ''}{args.concurrency}")
+    print_info(f"Template: {args.template} ({args.prompt_layout} prompt layout)")
     
     # Load categories and template
     categories = load_categories()
@@ -646,7 +1098,7 @@ def main():
         print_error("No categories found. Please check the categories file.")
         return
     
-    template = load_template()
+    template = load_template(args.template)
     
     # Setup for graceful termination
     stop_event = threading.Event()
@@ -658,68 +1110,53 @@ def main():
     # Register signal handler for Ctrl+C
     signal.signal(signal.SIGINT, signal_handler)
     
+    def on_event(event: str, data: Dict[str, Any]):
+        journal.record(event, data)
+        progress = f"[{journal.generated}/{journal.target}]"
+        if event == "started":
+            print(f"{progress} Generating idea for category: {data['category']}...", end="\r")
+        elif event == "skipped":
+            early = " (aborted early)" if data.get('early') else " (semantic match)" if data.get('semantic') else ""
+            print(f"{progress} Skipped: Similar idea already exists for {data['category']}{early}".ljust(80))
+        elif event == "generated":
+            print(f"{progress} Generated: {data['name']} (Category: {data['category']})".ljust(80))
+        elif event == "error":
+            print(f"{progress} Error: {data['error']}".ljust(80))
+    
     # Generate ideas
-    successful_generations = 0
-    attempts = 0
+    engine = GenerationEngine(args.model, template, categories, args.similarity_threshold,
+                              concurrency=args.concurrency, stream=args.stream,
+                              similarity_backend=args.similarity_backend, global_dedup=args.global_dedup,
+                              semantic_threshold=args.semantic_threshold, embedding_model=args.embedding_model,
+                              stop_event=stop_event, on_event=on_event, initial_jobs=journal.take_unfinished(),
+                              prompt_layout=args.prompt_layout, keep_alive=parse_keep_alive(args.keep_alive),
+                              adaptive_concurrency=args.adaptive_concurrency)
     
     try:
-        while successful_generations < args.num_ideas and not stop_event.is_set():
-            attempts += 1
-            
-            # Periodically clean up memory
-            if attempts % 50 == 0:
-                gc.collect()
-            
-            # Randomly select a category
-            category = random.choice(categories)
-            
-            # Show progress
-            progress = f"[{successful_generations}/{args.num_ideas}]"
-            print(f"{progress} Generating idea for category: {category}...", end="\r")
-            
-            try:
-                # Generate the idea
-                idea, filename = generate_idea_with_ollama(category, args.model, template)
-                
-                # Check if the idea is similar to existing ideas
-                category_folder = os.path.join(CATEGORIES_DIR, get_category_folder_name(category))
-                existing_ideas = get_existing_ideas(category_folder)
-                
-                if is_similar_idea(idea, existing_ideas, args.similarity_threshold):
-                    print(f"{progress} Skipped: Similar idea already exists for {category}".ljust(80))
-                    continue
-                
-                # Save the idea
-                file_path = save_idea(idea, category, filename)
-                
-                # Extract the assistant name for display
-                name_match = re.search(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n', idea)
-                if name_match:
-                    assistant_name = name_match.group(1).strip()
-                    print(f"{progress} Generated: {assistant_name} (Category: {category})".ljust(80))
-                else:
-                    print(f"{progress} Generated idea for category: {category}".ljust(80))
-                
-                successful_generations += 1
-                
-            except Exception as e:
-                print(f"{progress} Error: {str(e)}".ljust(80))
-                # Wait a bit before trying again
-                time.sleep(1)
-            
-            # Small delay between generations to prevent overloading Ollama
-            time.sleep(0.1)
+        stats = engine.run(args.num_ideas)
         
         print("\n" + "=" * 80)
-        if stop_event.is_set():
+        if engine.failure:
+            journal.finish("failed")
+            print_error(f"Generation stopped early: {engine.failure}")
+            print_info(f"Resume with: --resume {journal.run_id}")
+        elif stop_event.is_set():
+            journal.finish("stopped")
             print_info("Generation stopped by user")
+            print_info(f"Resume with: --resume {journal.run_id}")
         else:
+            journal.finish("completed")
             print_info("Generation Complete")
         
-        print_success(f"Successfully generated {successful_generations} ideas after {attempts} attempts.")
+        print_success(f"Successfully generated {stats['generated']} ideas after {stats['attempts']} attempts.")
+        if engine.controller is not None:
+            print_info(f"Concurrency settled at {engine.controller.limit} requests")
+        print_metrics_summary(args.metrics_json)
         
     except Exception as e:
+        journal.finish("failed")
         print_error(f"\nUnexpected error: {str(e)}")
+        print_info(f"Resume with: --resume {journal.run_id}")
     finally:
         # Final memory cleanup
         gc.collect()
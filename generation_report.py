@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Generation Report for AI Agent Ideation Generator
+
+This script summarises the token counts and timings that Ollama reported for each
+saved idea (the idea_generation_stats table in ideas.db): generation speed in
+tokens per second, prompt-processing cost and model load overhead, grouped by model,
+category or creativity level. Use it to compare models and size hardware.
+"""
+
+import os
+import json
+import sqlite3
+import argparse
+from typing import List, Dict, Any, Optional
+
+import db_setup
+
+# Constants
+COLD_LOAD_NS = 500_000_000  # Load time above which a request counts as a model load
+GROUPINGS = {
+    "model": ["s.model"],
+    "category": ["c.name"],
+    "model-category": ["s.model", "c.name"],
+    "creativity": ["s.model", "s.creativity_level"],
+}
+GROUP_NAMES = {"s.model": "model", "c.name": "category", "s.creativity_level": "creativity_level"}
+
+def _ratio(numerator: Optional[float], denominator: Optional[float], scale: float = 1.0) -> Optional[float]:
+    if numerator is None or not denominator:
+        return None
+    return numerator / denominator * scale
+
+def load_report(conn: sqlite3.Connection, by: str = "model", model: Optional[str] = None,
+                category: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Aggregate the generation statistics of saved ideas.
+    
+    Args:
+        conn: Connection to the ideas database
+        by: Grouping, one of GROUPINGS
+        model: Only include ideas generated by this model
+        category: Only include ideas in this category
+    
+    Returns:
+        One row per group, with the number of ideas and the derived speeds and costs
+    """
+    columns = GROUPINGS[by]
+    conditions, params = [], [COLD_LOAD_NS]
+    if model:
+        conditions.append("s.model = ?")
+        params.append(model)
+    if category:
+        conditions.append("c.name = ?")
+        params.append(category)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    rows = conn.execute(f'''
+    SELECT {', '.join(columns)}, COUNT(*),
+           SUM(s.eval_count), SUM(s.eval_duration), SUM(s.prompt_eval_count), SUM(s.prompt_eval_duration),
+           SUM(s.load_duration), SUM(s.total_duration), SUM(s.load_duration >= ?)
+    FROM idea_generation_stats s
+    JOIN ideas i ON i.id = s.idea_id
+    JOIN categories c ON c.id = i.category_id
+    {where}
+    GROUP BY {', '.join(columns)}
+    ORDER BY COUNT(*) DESC, {', '.join(columns)}
+    ''', params).fetchall()
+    
+    report = []
+    for row in rows:
+        group = dict(zip((GROUP_NAMES[column] for column in columns), row[:len(columns)]))
+        ideas, eval_count, eval_ns, prompt_count, prompt_ns, load_ns, total_ns, loads = row[len(columns):]
+        report.append({
+            **group,
+            "ideas": ideas,
+            "avg_eval_tokens": _ratio(eval_count, ideas),
+            "eval_tokens_per_second": _ratio(eval_count, eval_ns, 1e9),
+            "avg_prompt_tokens": _ratio(prompt_count, ideas),
+            "prompt_tokens_per_second": _ratio(prompt_count, prompt_ns, 1e9),
+            "avg_prompt_ms": _ratio(prompt_ns, ideas, 1e-6),
+            "avg_load_ms": _ratio(load_ns, ideas, 1e-6),
+            "load_share": _ratio(load_ns, total_ns),
+            "model_loads": loads or 0,
+            "avg_total_seconds": _ratio(total_ns, ideas, 1e-9)
+        })
+    return report
+
+def print_report(report: List[Dict[str, Any]], by: str):
+    """Print the report as a table."""
+    def number(value: Optional[float], digits: int = 1) -> str:
+        return "-" if value is None else f"{value:.{digits}f}"
+    
+    group_columns = [GROUP_NAMES[column] for column in GROUPINGS[by]]
+    widths = {name: max([len(name)] + [len(str(row[name])) for row in report]) for name in group_columns}
+    
+    print(" ".join(f"{name:<{widths[name]}}" for name in group_columns) +
+          f" {'ideas':>6} {'out tok':>8} {'tok/s':>7} {'in tok':>7} {'in tok/s':>9} "
+          f"{'prompt ms':>10} {'load ms':>8} {'load %':>7} {'loads':>6} {'total s':>8}")
+    for row in report:
+        load_share = None if row["load_share"] is None else row["load_share"] * 100
+        print(" ".join(f"{str(row[name]):<{widths[name]}}" for name in group_columns) +
+              f" {row['ideas']:>6} {number(row['avg_eval_tokens'], 0):>8} {number(row['eval_tokens_per_second']):>7}"
+              f" {number(row['avg_prompt_tokens'], 0):>7} {number(row['prompt_tokens_per_second']):>9}"
+              f" {number(row['avg_prompt_ms']):>10} {number(row['avg_load_ms']):>8} {number(load_share):>7}"
+              f" {row['model_loads']:>6} {number(row['avg_total_seconds'], 2):>8}")
+
+def main():
+    """Print the generation statistics report."""
+    parser = argparse.ArgumentParser(description="Report Ollama token and timing statistics of generated ideas")
+    parser.add_argument("--by", choices=list(GROUPINGS), default="model", help="How to group the ideas (default: model)")
+    parser.add_argument("--model", type=str, default=None, help="Only include ideas generated by this model")
+    parser.add_argument("--category", type=str, default=None, help="Only include ideas in this category")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+    
+    if not os.path.exists(db_setup.DB_PATH):
+        print(f"Database not found: {db_setup.DB_PATH}")
+        return
+    
+    conn = sqlite3.connect(f"file:{db_setup.DB_PATH}?mode=ro", uri=True)
+    try:
+        report = load_report(conn, args.by, args.model, args.category)
+    except sqlite3.OperationalError as e:
+        if "no such table" in str(e):
+            # The table is created the first time ideas are saved with statistics
+            report = []
+        else:
+            print(f"Error reading generation statistics: {str(e)}")
+            return
+    finally:
+        conn.close()
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+    elif not report:
+        print("No generation statistics recorded yet. They are saved for each idea generated from now on.")
+    else:
+        print_report(report, args.by)
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,6 @@ It allows users to select a model, set the number of ideas to generate, and view
 
 import sys
 import os
-import re
-import time
-import random
 import threading
 import gc
 from datetime import datetime
@@ -42,9 +39,8 @@ except ImportError:
 # Import the core functionality
 try:
     from generate_agent_ideas import (
-        load_categories, load_template, get_category_folder_name,
-        get_existing_ideas, is_similar_idea, generate_idea_with_ollama,
-        save_idea, get_available_models, update_index
+        load_categories, load_template, get_available_models,
+        GenerationEngine, DEFAULT_CONCURRENCY
     )
 except ImportError:
     print("Error importing core functionality. Make sure generate_agent_ideas.py is in the same directory.")
@@ -54,8 +50,6 @@ except ImportError:
 REPO_PATH = os.path.dirname(os.path.abspath(__file__))
 CATEGORIES_DIR = os.path.join(REPO_PATH, "by-category")
 DEFAULT_MODEL = "llama3.2"
-MAX_RETRIES = 3  # Maximum number of retries for failed generations
-RETRY_DELAY = 2  # Delay between retries in seconds
 
 class IdeaGeneratorThread(QThread):
     """Thread for generating AI agent ideas."""
@@ -67,105 +61,80 @@ class IdeaGeneratorThread(QThread):
     error_occurred = pyqtSignal(str)  # error message
     generation_complete = pyqtSignal()  # emitted when generation is complete
     
-    def __init__(self, model: str, num_ideas: int, similarity_threshold: float, unlimited: bool = False, use_creativity_distribution: bool = True):
+    def __init__(self, model: str, num_ideas: int, similarity_threshold: float, unlimited: bool = False,
+                 use_creativity_distribution: bool = True, concurrency: int = DEFAULT_CONCURRENCY,
+                 stream: bool = False, adaptive_concurrency: bool = False):
         super().__init__()
         self.model = model
         self.num_ideas = num_ideas
         self.similarity_threshold = similarity_threshold
         self.unlimited = unlimited
         self.use_creativity_distribution = use_creativity_distribution
-        self.running = True
+        self.concurrency = concurrency
+        self.stream = stream
+        self.adaptive_concurrency = adaptive_concurrency
+        self.stop_event = threading.Event()
+        self.engine = None
         self.categories = load_categories()
         self.template = load_template()
     
+    @property
+    def running(self) -> bool:
+        """Whether the thread has not been asked to stop."""
+        return not self.stop_event.is_set()
+    
+    def handle_event(self, event: str, data: Dict[str, Any]):
+        """Translate generation engine events into UI signals."""
+        creativity_level = data.get("creativity_level")
+        display_creativity = creativity_level.replace('_', ' ').title() if creativity_level else "Random"
+        
+        if event == "started":
+            self.log_message.emit(f"Generating idea for category: {data['category']}" +
+                                  (f" (Creativity: {creativity_level.replace('_', ' ')})" if creativity_level else ""))
+        elif event == "skipped":
+            self.log_message.emit(f"Skipped: Similar idea already exists for {data['category']}" +
+                                  (" (aborted early)" if data.get('early') else ""))
+        elif event == "generated":
+            self.log_message.emit(f"Generated: {data['name']} (Category: {data['category']}, Creativity: {display_creativity})")
+            self.log_message.emit(f"Saved to: {data['file_path']}")
+            
+            # Emit the idea generated signal
+            self.idea_generated.emit(data['name'], data['category'], data['file_path'], display_creativity)
+            self.progress_updated.emit(self.engine.stats["generated"], self.num_ideas)
+        elif event == "error":
+            self.log_message.emit(f"Error: {data['error']}")
+            self.error_occurred.emit(f"Failed to generate idea for {data['category']}: {data['error']}")
+    
     def run(self):
         """Run the idea generation thread."""
         if not self.categories:
             self.error_occurred.emit("No categories found. Please check the categories file.")
             return
         
-        successful_generations = 0
-        attempts = 0
+        self.engine = GenerationEngine(
+            self.model, self.template, self.categories, self.similarity_threshold,
+            concurrency=self.concurrency,
+            stream=self.stream,
+            use_creativity_distribution=self.use_creativity_distribution,
+            stop_event=self.stop_event,
+            on_event=self.handle_event,
+            adaptive_concurrency=self.adaptive_concurrency
+        )
         
         try:
-            while (self.unlimited or successful_generations < self.num_ideas) and self.running:
-                attempts += 1
-                
-                # Periodically clean up memory
-                if attempts % 20 == 0:
-                    gc.collect()
-                
-                # Randomly select a category
-                category = random.choice(self.categories)
-                
-                # Randomly select a creativity level if distribution is enabled
-                creativity_level = None
-                if self.use_creativity_distribution:
-                    creativity_levels = ["basic", "moderate", "creative", "highly_creative"]
-                    creativity_level = random.choice(creativity_levels)
-                
-                self.log_message.emit(f"Generating idea for category: {category}" + 
-                                     (f" (Creativity: {creativity_level.replace('_', ' ')})" if creativity_level else ""))
-                
-                # Try to generate with retries
-                retry_count = 0
-                generation_successful = False
-                while retry_count < MAX_RETRIES and not generation_successful and self.running:
-                    try:
-                        # Generate the idea
-                        idea, filename = generate_idea_with_ollama(category, self.model, self.template, creativity_level)
-                        
-                        # Check if the idea is similar to existing ideas
-                        category_folder = os.path.join(CATEGORIES_DIR, get_category_folder_name(category))
-                        existing_ideas = get_existing_ideas(category_folder)
-                        
-                        if is_similar_idea(idea, existing_ideas, self.similarity_threshold):
-                            self.log_message.emit(f"Skipped: Similar idea already exists for {category}")
-                            break
-                        
-                        # Save the idea
-                        file_path = save_idea(idea, category, filename)
-                        
-                        # Extract the assistant name for display
-                        name_match = re.search(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n', idea)
-                        if name_match:
-                            assistant_name = name_match.group(1).strip()
-                        else:
-                            assistant_name = filename.replace('-', ' ').title()
-                        
-                        # Format creativity level for display
-                        display_creativity = creativity_level.replace('_', ' ').title() if creativity_level else "Random"
-                        
-                        self.log_message.emit(f"Generated: {assistant_name} (Category: {category}, Creativity: {display_creativity})")
-                        self.log_message.emit(f"Saved to: {file_path}")
-                        
-                        # Emit the idea generated signal
-                        self.idea_generated.emit(assistant_name, category, file_path, display_creativity if creativity_level else "Random")
-                        
-                        successful_generations += 1
-                        self.progress_updated.emit(successful_generations, self.num_ideas)
-                        
-                        generation_successful = True
-                        
-                    except Exception as e:
-                        retry_count += 1
-                        error_message = f"Error (attempt {retry_count}/{MAX_RETRIES}): {str(e)}"
-                        self.log_message.emit(error_message)
-                        
-                        if retry_count >= MAX_RETRIES:
-                            self.error_occurred.emit(f"Failed to generate idea after {MAX_RETRIES} attempts: {str(e)}")
-                        else:
-                            # Wait before retrying
-                            time.sleep(RETRY_DELAY)
-                
-                # Small delay between generations to prevent overloading Ollama
-                time.sleep(0.1)
+            stats = self.engine.run(self.num_ideas, unlimited=self.unlimited)
+            
+            if self.engine.controller is not None:
+                self.log_message.emit(f"Concurrency settled at {self.engine.controller.limit} requests")
             
-            if self.running:
-                self.log_message.emit(f"Generation complete. Generated {successful_generations} ideas after {attempts} attempts.")
+            if self.engine.failure:
+                self.error_occurred.emit(f"Generation stopped early: {self.engine.failure}")
+                self.generation_complete.emit()
+            elif self.running:
+                self.log_message.emit(f"Generation complete. Generated {stats['generated']} ideas after {stats['attempts']} attempts.")
                 self.generation_complete.emit()
             else:
-                self.log_message.emit(f"Generation stopped. Generated {successful_generations} ideas after {attempts} attempts.")
+                self.log_message.emit(f"Generation stopped. Generated {stats['generated']} ideas after {stats['attempts']} attempts.")
         
         except Exception as e:
             error_message = f"Unexpected error: {str(e)}\n{traceback.format_exc()}"
@@ -175,8 +144,8 @@ class IdeaGeneratorThread(QThread):
             gc.collect()
     
     def stop(self):
-        """Stop the idea generation thread."""
-        self.running = False
+        """Stop the idea generation thread once in-flight requests have finished."""
+        self.stop_event.set()
 
 class ModelRefreshThread(QThread):
     """Thread for refreshing the list of available models."""
@@ -297,6 +266,29 @@ class MainWindow(QMainWindow):
         self.similarity_label = QLabel("0.80")
         similarity_layout.addWidget(self.similarity_label)
         
+        # Concurrent requests
+        concurrency_layout = QHBoxLayout()
+        advanced_layout.addLayout(concurrency_layout)
+        
+        concurrency_layout.addWidget(QLabel("Concurrent Requests:"))
+        
+        self.concurrency_spinbox = QSpinBox()
+        self.concurrency_spinbox.setMinimum(1)
+        self.concurrency_spinbox.setMaximum(32)
+        self.concurrency_spinbox.setValue(DEFAULT_CONCURRENCY)
+        concurrency_layout.addWidget(self.concurrency_spinbox)
+        concurrency_layout.addStretch()
+        
+        # Adaptive concurrency, with the spinbox value as the maximum
+        self.adaptive_checkbox = QCheckBox("Adapt concurrency to Ollama's load (up to Concurrent Requests)")
+        self.adaptive_checkbox.setChecked(False)
+        advanced_layout.addWidget(self.adaptive_checkbox)
+        
+        # Streaming with early duplicate abort
+        self.stream_checkbox = QCheckBox("Stream responses and abort duplicates early")
+        self.stream_checkbox.setChecked(False)
+        advanced_layout.addWidget(self.stream_checkbox)
+        
         # Creativity distribution
         self.creativity_checkbox = QCheckBox("Use creativity distribution")
         self.creativity_checkbox.setChecked(True)
@@ -453,6 +445,15 @@ class MainWindow(QMainWindow):
         # Get the creativity distribution
         use_creativity_distribution = self.creativity_checkbox.isChecked()
         
+        # Get the number of concurrent requests
+        concurrency = self.concurrency_spinbox.value()
+        
+        # Get the streaming mode
+        stream = self.stream_checkbox.isChecked()
+        
+        # Get the adaptive concurrency mode
+        adaptive_concurrency = self.adaptive_checkbox.isChecked()
+        
         # Update the UI
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
@@ -470,9 +471,13 @@ class MainWindow(QMainWindow):
         self.log_message(f"Number of ideas: {'Unlimited' if unlimited else num_ideas}")
         self.log_message(f"Similarity threshold: {similarity_threshold:.2f}")
         self.log_message(f"Creativity distribution: {'Enabled' if use_creativity_distribution else 'Disabled'}")
+        self.log_message(f"Concurrent requests: {'up to ' if adaptive_concurrency else ''}{concurrency}")
+        self.log_message(f"Streaming: {'Enabled' if stream else 'Disabled'}")
         
         # Create and start the generator thread
-        self.generator_thread = IdeaGeneratorThread(model, num_ideas, similarity_threshold, unlimited, use_creativity_distribution)
+        self.generator_thread = IdeaGeneratorThread(model, num_ideas, similarity_threshold, unlimited,
+                                                    use_creativity_distribution, concurrency, stream,
+                                                    adaptive_concurrency)
         self.generator_thread.progress_updated.connect(self.update_progress)
         self.generator_thread.idea_generated.connect(self.idea_generated)
         self.generator_thread.log_message.connect(self.log_message)
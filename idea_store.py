@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Idea Store for AI Agent Ideation Generator
+
+This module is the persistence layer for generated ideas. Ideas are buffered in memory
+and written to ideas.db in batched transactions over one long-lived WAL-mode
+connection, so the CLI, the GUI and the web viewer all keep the database current
+without opening a connection and committing once per idea.
+
+The rendered HTML of each idea is stored alongside it when it is saved, so the web
+viewer does not run Markdown on every page view.
+"""
+
+import os
+import re
+import atexit
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+import markdown
+
+import db_setup
+from metrics import span
+from ollama_client import RESPONSE_STATS_FIELDS
+
+DEFAULT_BATCH_SIZE = 20  # Flush once this many ideas are buffered
+DEFAULT_FLUSH_INTERVAL = 5.0  # Flush buffered ideas at least this often, in seconds
+HTML_CACHE_SIZE = 256  # Rendered ideas kept in memory
+POOL_SIZE = 8  # Idle read connections kept per database
+STATEMENT_CACHE_SIZE = 256  # Prepared statements cached per connection
+MIN_MMAP_SIZE = 64 * 1024 * 1024
+MAX_MMAP_SIZE = 1024 * 1024 * 1024
+MARKDOWN_EXTENSIONS = ['tables', 'fenced_code']
+
+def extract_description(idea: str) -> str:
+    """Extract the full short description of an idea."""
+    desc_match = re.search(r'## 2\. Short Description:\s*\n\s*(.+?)\s*\n## ', idea, re.DOTALL)
+    return desc_match.group(1).strip() if desc_match else ""
+
+def content_hash(content: str) -> str:
+    """Get the hash that identifies a version of an idea's content."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def render_markdown(content: str) -> str:
+    """Render the markdown of an idea to HTML."""
+    return markdown.markdown(content, extensions=MARKDOWN_EXTENSIONS)
+
+class RenderedHtmlCache:
+    """Rendered HTML of ideas: an in-process LRU in front of the idea_html table."""
+    
+    def __init__(self, max_size: int = HTML_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # Content hash -> HTML
+        self._lock = threading.Lock()
+    
+    def _remember(self, key: str, html: str):
+        """Add an entry to the LRU, evicting the least recently used one if full."""
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def get(self, conn: Optional[sqlite3.Connection], idea_id: Optional[int], content: str) -> str:
+        """Get the rendered HTML of an idea, rendering and storing it on a miss.
+        
+        Args:
+            conn: Connection to the ideas database (None to skip the stored cache)
+            idea_id: ID of the idea (None for ideas that are not in the database)
+            content: The current markdown content of the idea
+        """
+        key = content_hash(content)
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                return html
+        
+        if conn is not None and idea_id is not None:
+            row = conn.execute("SELECT content_hash, html FROM idea_html WHERE idea_id = ?", (idea_id,)).fetchone()
+            if row and row[0] == key:
+                self._remember(key, row[1])
+                return row[1]
+        
+        html = render_markdown(content)
+        self._remember(key, html)
+        if conn is not None and idea_id is not None:
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO idea_html (idea_id, content_hash, html) VALUES (?, ?, ?)",
+                        (idea_id, key, html)
+                    )
+            except sqlite3.Error as e:
+                print(f"Error caching rendered idea: {str(e)}")
+        return html
+
+_html_cache = RenderedHtmlCache()
+
+def get_rendered_html(conn: Optional[sqlite3.Connection], idea_id: Optional[int], content: str) -> str:
+    """Get the rendered HTML of an idea from the process-wide cache."""
+    return _html_cache.get(conn, idea_id, content)
+
+def open_connection(db_path: str, cached_statements: int = 128) -> sqlite3.Connection:
+    """Open a connection to the ideas database in WAL mode."""
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=cached_statements)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+class ConnectionPool:
+    """Reusable read/write connections to one ideas database.
+    
+    Opening a connection and re-preparing every statement costs more than most of the
+    queries the web viewer runs, so connections are handed back to the pool instead of
+    being closed. Each thread also has its own connection for use outside of requests.
+    """
+    
+    def __init__(self, db_path: str, max_idle: int = POOL_SIZE):
+        self.db_path = db_path
+        self.max_idle = max_idle
+        self._idle: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open a tuned connection with memory-mapped I/O sized to the database."""
+        conn = open_connection(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
+        try:
+            size = os.path.getsize(self.db_path)
+        except OSError:
+            size = 0
+        # Leave room for the database to grow while the connection stays in the pool
+        mmap_size = min(MAX_MMAP_SIZE, max(MIN_MMAP_SIZE, size * 2))
+        conn.execute(f"PRAGMA mmap_size={mmap_size}")
+        return conn
+    
+    def acquire(self) -> sqlite3.Connection:
+        """Take an idle connection from the pool, opening a new one if none is idle."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._open()
+    
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool, closing it if the pool is full."""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
+    
+    def thread_connection(self) -> sqlite3.Connection:
+        """Get the connection owned by the calling thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+        return conn
+    
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+def get_connection_pool(db_path: Optional[str] = None) -> ConnectionPool:
+    """Get the process-wide connection pool of a database, creating it on first use."""
+    db_path = db_path or db_setup.DB_PATH
+    with _pools_lock:
+        if db_path not in _pools:
+            _pools[db_path] = ConnectionPool(db_path)
+            atexit.register(_pools[db_path].close)
+        return _pools[db_path]
+
+class IdeaStore:
+    """Buffered, transactional writer of ideas to the SQLite database."""
+    
+    def __init__(self, db_path: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        """Initialize the store.
+        
+        Args:
+            db_path: Path of the SQLite database (defaults to ideas.db in the repository)
+            batch_size: Number of buffered ideas that triggers a flush
+            flush_interval: Maximum time in seconds an idea stays buffered
+        """
+        self.db_path = db_path or db_setup.DB_PATH
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Tuple[str, str, str, str, str, str, str, str, Optional[Dict[str, Any]]]] = []
+        self._category_ids: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._flush_event = threading.Event()
+        self._closed = False
+        
+        if not os.path.exists(self.db_path) and self.db_path == db_setup.DB_PATH:
+            # A new database starts with the ideas that already exist on disk
+            db_setup.create_database()
+            db_setup.import_existing_ideas()
+        
+        self.conn = open_connection(self.db_path)
+        db_setup.create_schema(self.conn.cursor())
+        self.conn.commit()
+        
+        self._flusher = threading.Thread(target=self._flush_periodically, name="idea-store-flusher", daemon=True)
+        self._flusher.start()
+    
+    def _flush_periodically(self):
+        """Background loop that flushes ideas that have been buffered for too long."""
+        while not self._closed:
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing ideas to the database: {str(e)}")
+    
+    def _category_id(self, cursor: sqlite3.Cursor, category: str) -> int:
+        """Get the ID of a category, creating it if needed (call inside a transaction)."""
+        if category in self._category_ids:
+            return self._category_ids[category]
+        
+        cursor.execute("SELECT id FROM categories WHERE name = ?", (category,))
+        row = cursor.fetchone()
+        if row:
+            category_id = row[0]
+        else:
+            folder_name = category.lower().replace(' ', '-')
+            cursor.execute(
+                "INSERT OR IGNORE INTO categories (name, folder_name) VALUES (?, ?)",
+                (category, folder_name)
+            )
+            cursor.execute("SELECT id FROM categories WHERE name = ? OR folder_name = ?", (category, folder_name))
+            category_id = cursor.fetchone()[0]
+        
+        self._category_ids[category] = category_id
+        return category_id
+    
+    def add(self, name: str, description: str, category: str, file_path: str, content: str,
+            created_at: Optional[str] = None, generation_stats: Optional[Dict[str, Any]] = None):
+        """Buffer an idea for the next batched write.
+        
+        Args:
+            name: The assistant name
+            description: The short description
+            category: The category display name
+            file_path: Path of the markdown export, relative to the repository
+            content: The full markdown content
+            created_at: Creation timestamp (defaults to now)
+            generation_stats: Model, creativity level and Ollama token counts and durations
+                of the request that generated the idea (None if unknown)
+        """
+        created_at = created_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        html = render_markdown(content)
+        with self._lock:
+            self._buffer.append((name, description, category, file_path, created_at, content,
+                                 content_hash(content), html, generation_stats or None))
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+    
+    def flush(self) -> int:
+        """Write all buffered ideas in a single transaction.
+        
+        Returns:
+            The number of ideas written
+        """
+        with self._lock:
+            if not self._buffer:
+                return 0
+            
+            batch, self._buffer = self._buffer, []
+            try:
+                with span("flush"), self.conn:
+                    cursor = self.conn.cursor()
+                    rows = [(name, description, self._category_id(cursor, category), file_path, created_at, content)
+                            for name, description, category, file_path, created_at, content, _, _, _ in batch]
+                    cursor.executemany(
+                        """
+                        INSERT INTO ideas (name, description, category_id, file_path, created_at, content)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(file_path) DO UPDATE SET
+                            name = excluded.name,
+                            description = excluded.description,
+                            category_id = excluded.category_id,
+                            content = excluded.content
+                        """,
+                        rows
+                    )
+                    cursor.executemany(
+                        """
+                        INSERT OR REPLACE INTO idea_html (idea_id, content_hash, html)
+                        SELECT id, ?, ? FROM ideas WHERE file_path = ?
+                        """,
+                        [(key, html, file_path) for _, _, _, file_path, _, _, key, html, _ in batch]
+                    )
+                    cursor.executemany(
+                        f"""
+                        INSERT OR REPLACE INTO idea_generation_stats
+                            (idea_id, model, creativity_level, {', '.join(RESPONSE_STATS_FIELDS)})
+                        SELECT id, ?, ?, {', '.join('?' for _ in RESPONSE_STATS_FIELDS)} FROM ideas WHERE file_path = ?
+                        """,
+                        [(stats.get("model"), stats.get("creativity_level"),
+                          *[stats.get(field) for field in RESPONSE_STATS_FIELDS], file_path)
+                         for _, _, _, file_path, _, _, _, _, stats in batch if stats]
+                    )
+            except Exception:
+                # Keep the ideas for the next attempt and forget cached IDs from the rolled-back transaction
+                self._buffer = batch + self._buffer
+                self._category_ids.clear()
+                raise
+            
+            return len(batch)
+    
+    def close(self):
+        """Flush any buffered ideas and close the connection."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._flush_event.set()
+            self.flush()
+            self.conn.close()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_idea_store() -> IdeaStore:
+    """Get the process-wide shared idea store, creating it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = IdeaStore()
+            atexit.register(_store.close)
+        return _store
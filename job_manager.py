@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Job Manager for AI Agent Ideation Generator
+
+This module runs several generation jobs side by side in one process. Each job has
+an ID, its own stats, log ring buffer and event bus, and can be stopped on its own.
+A bounded number of jobs run at once (the rest wait in a queue), and every job
+draws its Ollama requests from one shared concurrency budget, so parallel jobs for
+different models or categories never overload the server together.
+"""
+
+import uuid
+import threading
+from collections import deque, OrderedDict
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Callable
+
+from event_bus import EventBus
+
+MAX_ACTIVE_JOBS = 4  # Jobs running at the same time; later jobs are queued
+OLLAMA_CONCURRENCY = 4  # Ollama requests in flight across all jobs
+MAX_FINISHED_JOBS = 50  # Finished jobs kept for their status pages
+LOG_SIZE = 100  # Log messages kept per job
+QUEUE_POLL_INTERVAL = 0.5  # Seconds between stop checks while a job is queued
+
+class Job:
+    """One generation run: its parameters, progress and log."""
+    
+    def __init__(self, params: Dict[str, Any], total: int = 0):
+        """Initialize the job.
+        
+        Args:
+            params: The generation parameters, as given by the caller
+            total: Number of ideas requested (0 for unlimited)
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.params = params
+        self.status = "queued"
+        self.error = None
+        self.created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.started_at = None
+        self.finished_at = None
+        self.stats = {"total": total, "attempts": 0, "generated": 0, "skipped": 0, "errors": 0}
+        self.log_messages = deque(maxlen=LOG_SIZE)
+        self.events = EventBus()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self._lock = threading.Lock()
+    
+    @property
+    def active(self) -> bool:
+        """Whether the job is queued or running."""
+        return self.status in ("queued", "running", "stopping")
+    
+    def log(self, message: str):
+        """Add a message to the job's log and publish it."""
+        entry = f"[{datetime.now().strftime('%H:%M:%S')}] {message}"
+        with self._lock:
+            self.log_messages.append(entry)
+        self.events.publish("log", message=entry)
+    
+    def count(self, stat: str, latency: Optional[float] = None):
+        """Increment a counter and publish the new progress."""
+        with self._lock:
+            self.stats[stat] += 1
+            stats = dict(self.stats)
+        self.events.publish("progress", latency=latency, **stats)
+    
+    def stop(self):
+        """Ask the job to stop once its in-flight requests have finished."""
+        if self.active:
+            self.stop_event.set()
+            if self.status == "running":
+                self.status = "stopping"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a JSON-serialisable summary of the job."""
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "error": self.error,
+                "params": dict(self.params),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "last_event_id": self.events.last_id,
+                "log": list(self.log_messages),
+                **self.stats
+            }
+
+class JobManager:
+    """Queue and run generation jobs within a shared Ollama concurrency budget."""
+    
+    def __init__(self, max_active_jobs: int = MAX_ACTIVE_JOBS, ollama_concurrency: int = OLLAMA_CONCURRENCY):
+        """Initialize the manager.
+        
+        Args:
+            max_active_jobs: Maximum number of jobs running at the same time
+            ollama_concurrency: Maximum number of Ollama requests in flight across all jobs
+        """
+        self.ollama_concurrency = ollama_concurrency
+        self.limiter = threading.BoundedSemaphore(ollama_concurrency)
+        self._job_slots = threading.BoundedSemaphore(max_active_jobs)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def submit(self, runner: Callable[[Job], None], params: Dict[str, Any], total: int = 0) -> Job:
+        """Queue a job.
+        
+        Args:
+            runner: Function that performs the job; it is called as runner(job) and should
+                share self.limiter between its Ollama requests and honour job.stop_event
+            params: The generation parameters
+            total: Number of ideas requested (0 for unlimited)
+        
+        Returns:
+            The new job
+        """
+        job = Job(params, total)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        
+        job.thread = threading.Thread(target=self._run, args=(job, runner), name=f"job-{job.id}", daemon=True)
+        job.thread.start()
+        return job
+    
+    def _run(self, job: Job, runner: Callable[[Job], None]):
+        """Wait for a free job slot, then run the job and publish its outcome."""
+        job.log("Queued")
+        while not self._job_slots.acquire(timeout=QUEUE_POLL_INTERVAL):
+            if job.stop_event.is_set():
+                break
+        else:
+            job.status = "stopping" if job.stop_event.is_set() else "running"
+            job.started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            try:
+                runner(job)
+            except Exception as e:
+                job.error = str(e)
+                job.log(f"Error: {str(e)}")
+            finally:
+                self._job_slots.release()
+        
+        if job.error:
+            job.status = "failed"
+        elif job.stop_event.is_set():
+            job.status = "stopped"
+        else:
+            job.status = "finished"
+        job.finished_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        job.events.publish("finished", **job.to_dict())
+        job.events.close()
+    
+    def _prune(self):
+        """Forget the oldest finished jobs beyond MAX_FINISHED_JOBS (call with the lock held)."""
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID."""
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def jobs(self) -> List[Job]:
+        """Get all known jobs, newest first."""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+    
+    def latest(self) -> Optional[Job]:
+        """Get the most recently submitted job."""
+        with self._lock:
+            return next(reversed(self._jobs.values()), None)
+    
+    def active_jobs(self) -> List[Job]:
+        """Get the jobs that are queued or running."""
+        return [job for job in self.jobs() if job.active]
+    
+    def stop(self, job_id: str) -> bool:
+        """Stop a job, returning False if there is no such job."""
+        job = self.get(job_id)
+        if job is None:
+            return False
+        job.stop()
+        return True
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Metrics for AI Agent Ideation Generator
+
+This module provides lightweight in-process instrumentation for the generation
+pipeline. Timing spans around each stage (prompt, Ollama request, similarity check,
+saving, index and database writes) feed histograms, and counters track the ideas
+generated, skipped and failed per category and model. The web viewer exposes the
+metrics in the Prometheus text format at /metrics, and the CLI prints a JSON summary
+at the end of each run.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+
+# Metric names
+STAGE_SECONDS = "ideation_stage_seconds"
+REQUEST_SECONDS = "ideation_request_seconds"
+IDEAS_TOTAL = "ideation_ideas_total"
+TOKENS_TOTAL = "ideation_tokens_total"
+ACTIVE_JOBS = "ideation_active_jobs"
+CONCURRENCY_LIMIT = "ideation_concurrency_limit"
+RETRIES_TOTAL = "ideation_retries_total"
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+                   30.0, 60.0, 120.0)
+
+METRIC_HELP = {
+    STAGE_SECONDS: ("histogram", "Time spent in each stage of the generation pipeline"),
+    REQUEST_SECONDS: ("histogram", "Time from submitting a generation request to its result, including retries"),
+    IDEAS_TOTAL: ("counter", "Generation requests by outcome (generated, skipped, error), category and model"),
+    TOKENS_TOTAL: ("counter", "Tokens processed by Ollama, by phase (prompt or eval) and model"),
+    ACTIVE_JOBS: ("gauge", "Web generation jobs that are queued or running"),
+    CONCURRENCY_LIMIT: ("gauge", "In-flight request limit chosen by the adaptive concurrency controller"),
+    RETRIES_TOTAL: ("counter", "Generation requests retried after a transient Ollama failure, by model"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = [(key, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for key, value in pairs]
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class Histogram:
+    """Bucketed distribution of observed values."""
+    
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        """Add a value to the distribution (call with the registry lock held)."""
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+    
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating within its bucket, as Prometheus does."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, count in enumerate(self.counts):
+            if cumulative + count >= rank and count > 0:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+class MetricsRegistry:
+    """Thread-safe store of counters, gauges and histograms keyed by name and labels."""
+    
+    def __init__(self):
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._gauges: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, name: str, value: float = 1.0, **labels):
+        """Increment a counter."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+    
+    def set(self, name: str, value: float, **labels):
+        """Set a gauge."""
+        with self._lock:
+            self._gauges.setdefault(name, {})[_labels(labels)] = value
+    
+    def observe(self, name: str, value: float, **labels):
+        """Add a value to a histogram."""
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+    
+    @contextmanager
+    def span(self, stage: str, **labels):
+        """Time a pipeline stage into the stage histogram, whether or not it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(STAGE_SECONDS, time.perf_counter() - started, stage=stage, **labels)
+    
+    def reset(self):
+        """Forget all recorded values."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+    
+    def render_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        
+        def header(name: str, default_kind: str):
+            kind, help_text = METRIC_HELP.get(name, (default_kind, name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+        
+        with self._lock:
+            for kind, metrics in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted(metrics):
+                    header(name, kind)
+                    for labels, value in sorted(metrics[name].items()):
+                        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            
+            for name in sorted(self._histograms):
+                header(name, "histogram")
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', repr(bound)))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum!r}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def summary(self) -> Dict[str, Any]:
+        """Get a JSON-serialisable summary: counter and gauge values, and the count, total
+        seconds, mean and estimated p50/p95 milliseconds of each histogram."""
+        with self._lock:
+            counters = {name: [{**dict(labels), "value": value} for labels, value in sorted(series.items())]
+                        for name, series in sorted(self._counters.items())}
+            gauges = {name: [{**dict(labels), "value": value} for labels, value in sorted(series.items())]
+                      for name, series in sorted(self._gauges.items())}
+            histograms = {
+                name: [{
+                    **dict(labels),
+                    "count": histogram.count,
+                    "sum_seconds": round(histogram.sum, 6),
+                    "mean_ms": round(histogram.sum * 1000 / histogram.count, 3) if histogram.count else 0.0,
+                    "p50_ms": round(histogram.quantile(0.50) * 1000, 3),
+                    "p95_ms": round(histogram.quantile(0.95) * 1000, 3)
+                } for labels, histogram in sorted(series.items())]
+                for name, series in sorted(self._histograms.items())
+            }
+        return {"counters": counters, "gauges": gauges, "histograms": histograms}
+    
+    def stage_summary(self) -> Dict[str, Dict[str, float]]:
+        """Get the stage histogram summaries keyed by stage name."""
+        return {entry.pop("stage"): entry for entry in self.summary()["histograms"].get(STAGE_SECONDS, [])
+                if "stage" in entry}
+
+_metrics = MetricsRegistry()
+
+def get_metrics() -> MetricsRegistry:
+    """Get the process-wide metrics registry."""
+    return _metrics
+
+def span(stage: str, **labels):
+    """Time a pipeline stage in the process-wide registry."""
+    return _metrics.span(stage, **labels)
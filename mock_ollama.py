@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Mock Ollama Server for AI Agent Ideation Generator
+
+This script serves a stand-in for the parts of the Ollama API the generator uses:
+/api/generate (streaming and non-streaming), /api/tags and /api/embeddings. Ideas
+are made up from the section headings of the idea template and random word lists,
+and the server can be given a fixed latency, a token rate and an error rate, so the
+generation pipeline can be exercised and benchmarked without a model.
+
+Point the generator at it with OLLAMA_HOST, e.g.:
+
+    python mock_ollama.py --port 11435 --latency 0.5 --token-rate 40
+    OLLAMA_HOST=http://127.0.0.1:11435 python generate_agent_ideas.py 20 --model mock
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Any, Optional
+
+# Constants
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 11435
+DEFAULT_MODELS = ["mock", "llama3.2", "nomic-embed-text"]
+EMBEDDING_SIZE = 256
+
+NAME_WORDS = [
+    ["Quantum", "Pocket", "Silent", "Rapid", "Civic", "Lucid", "Nimble", "Bright", "Hidden", "Steady",
+     "Tidy", "Wild", "Frugal", "Polar", "Amber", "Cobalt", "Velvet", "Iron", "Paper", "Lunar"],
+    ["Pantry", "Ledger", "Garden", "Harbor", "Studio", "Compass", "Archive", "Kitchen", "Atlas", "Workshop",
+     "Orchard", "Beacon", "Canvas", "Clinic", "Forge", "Lantern", "Market", "Signal", "Vault", "Trail"],
+    ["Planner", "Scout", "Coach", "Curator", "Mentor", "Auditor", "Navigator", "Tutor", "Keeper", "Analyst",
+     "Whisperer", "Wrangler", "Pilot", "Sentinel", "Critic", "Broker", "Sherpa", "Medic", "Clerk", "Sage"]
+]
+DESCRIPTION_WORDS = [
+    "tracks", "drafts", "explains", "schedules", "compares", "summarises", "checks", "translates", "maps",
+    "ranks", "receipts", "deadlines", "recipes", "contracts", "symptoms", "routes", "budgets", "lesson plans",
+    "inspections", "playlists", "warranties", "seedlings", "invoices", "interviews", "permits", "spreadsheets",
+    "for freelancers", "for new parents", "for small landlords", "for night-shift nurses", "for hobby beekeepers",
+    "for amateur astronomers", "for retirees", "for first-time founders", "for volunteer coaches"
+]
+FILLER_WORDS = [
+    "the", "assistant", "user", "helps", "with", "each", "step", "clearly", "and", "quickly", "using",
+    "local", "data", "reports", "a", "short", "summary", "of", "what", "changed", "since", "last", "week"
+]
+
+def make_idea(category: str, rng: random.Random, body_words: int = 300) -> str:
+    """Make up an idea in the layout of the idea template.
+    
+    Args:
+        category: The category the idea is for
+        rng: The random number generator to draw words from
+        body_words: Approximate number of words in the sections after the description
+    """
+    name = " ".join(rng.choice(words) for words in NAME_WORDS)
+    description = (f"{name} " + " ".join(rng.sample(DESCRIPTION_WORDS, 6)) +
+                   f" within {category.lower()}.")
+    sections = [
+        "Use Case Outline", "Benefits", "Potential Risks & Limitations",
+        "Context and RAG (Retrieval-Augmented Generation)", "Real-time Data and Search",
+        "Multimodal Capabilities", "Suggested Tools", "Draft System Prompt"
+    ]
+    per_section = max(1, body_words // len(sections))
+    
+    lines = [f"## 1. Assistant Name:\n\n{name}\n", f"## 2. Short Description:\n\n{description}\n"]
+    for number, section in enumerate(sections, start=3):
+        text = " ".join(rng.choice(FILLER_WORDS) for _ in range(per_section))
+        lines.append(f"## {number}. {section}:\n\n*   {text.capitalize()}.\n")
+    return "\n".join(lines)
+
+def embed_text(text: str, size: int = EMBEDDING_SIZE) -> List[float]:
+    """Get a deterministic bag-of-words embedding, so similar texts get similar vectors."""
+    vector = [0.0] * size
+    for word in re.findall(r'\w+', text.lower()):
+        vector[int(hashlib.md5(word.encode('utf-8')).hexdigest()[:8], 16) % size] += 1.0
+    norm = sum(value * value for value in vector) ** 0.5 or 1.0
+    return [value / norm for value in vector]
+
+class MockOllamaHandler(BaseHTTPRequestHandler):
+    """Request handler that answers like the Ollama API."""
+    
+    protocol_version = "HTTP/1.1"  # Keep connections alive, as Ollama does
+    disable_nagle_algorithm = True  # Headers and body are written separately
+    server: "MockOllamaServer"
+    
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+    
+    def _send_json(self, body: Dict[str, Any], status: int = 200):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+    
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json({"models": [{"name": name, "model": name, "size": 0} for name in self.server.models]})
+        elif self.path == "/":
+            self._send_json({"status": "Ollama is running"})
+        else:
+            self._send_json({"error": "not found"}, 404)
+    
+    def do_POST(self):
+        body = self._read_json()
+        if self.path == "/api/generate":
+            if self.server.slots is None:
+                self._generate(body)
+            else:
+                # Requests beyond the parallel limit wait, as in Ollama's queue
+                with self.server.slots:
+                    self._generate(body)
+        elif self.path == "/api/embeddings":
+            if self.server.fail():
+                self._send_json({"error": "mock embedding failure"}, 500)
+                return
+            self._send_json({"embedding": embed_text(body.get("prompt", ""))})
+        else:
+            self._send_json({"error": "not found"}, 404)
+    
+    def _generate(self, body: Dict[str, Any]):
+        """Answer a generation request with a made-up idea."""
+        started = time.monotonic()
+        model = body.get("model", "")
+        if model not in self.server.models:
+            self._send_json({"error": f"model '{model}' not found, try pulling it first"}, 404)
+            return
+        if self.server.fail():
+            time.sleep(self.server.request_latency())
+            self._send_json({"error": "mock generation failure"}, 500)
+            return
+        
+        prompt = body.get("prompt", "")
+        category_match = re.search(r'within the (.+?) category', prompt)
+        idea = make_idea(category_match.group(1) if category_match else "General", self.server.random(),
+                         self.server.body_words)
+        tokens = re.findall(r'\S+\s*', idea)
+        latency = self.server.request_latency()
+        token_delay = 1.0 / self.server.token_rate if self.server.token_rate > 0 else 0.0
+        
+        # Prompt processing happens before the first token
+        time.sleep(latency)
+        
+        def stats() -> Dict[str, Any]:
+            return {
+                "model": model,
+                "done": True,
+                "done_reason": "stop",
+                "total_duration": int((time.monotonic() - started) * 1e9),
+                "load_duration": 0,
+                "prompt_eval_count": len(prompt) // 4,
+                "prompt_eval_duration": int(latency * 1e9),
+                "eval_count": len(tokens),
+                "eval_duration": int(len(tokens) * token_delay * 1e9)
+            }
+        
+        if not body.get("stream", True):
+            time.sleep(len(tokens) * token_delay)
+            self._send_json({"response": idea, **stats()})
+            return
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for token in tokens:
+                self._write_chunk({"model": model, "response": token, "done": False})
+                if token_delay:
+                    time.sleep(token_delay)
+            self._write_chunk({"response": "", **stats()})
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client cancelled the generation
+            self.server.count_cancelled()
+            self.close_connection = True
+    
+    def _write_chunk(self, body: Dict[str, Any]):
+        data = (json.dumps(body) + "\n").encode('utf-8')
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+class MockOllamaServer(ThreadingHTTPServer):
+    """Threaded HTTP server that stands in for Ollama."""
+    
+    daemon_threads = True
+    
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, latency: float = 0.0,
+                 jitter: float = 0.0, token_rate: float = 0.0, error_rate: float = 0.0, parallel: int = 0,
+                 models: Optional[List[str]] = None, body_words: int = 300, seed: Optional[int] = None,
+                 verbose: bool = False):
+        """Initialize the server.
+        
+        Args:
+            host: The address to listen on
+            port: The port to listen on (0 for any free port)
+            latency: Seconds before the first token of each generation (prompt processing)
+            jitter: Maximum random seconds added to or taken from the latency
+            token_rate: Tokens generated per second (0 to answer at once)
+            error_rate: Fraction of requests answered with an HTTP 500 error (0.0-1.0)
+            parallel: Generations processed at once, like OLLAMA_NUM_PARALLEL; further
+                requests queue (0 for no limit)
+            models: The model names to report and accept (defaults to DEFAULT_MODELS)
+            body_words: Approximate number of words in each idea after the description
+            seed: Seed for the made-up ideas and errors (None for a random seed)
+            verbose: Log every request
+        """
+        super().__init__((host, port), MockOllamaHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.token_rate = token_rate
+        self.error_rate = error_rate
+        self.models = models or DEFAULT_MODELS
+        self.body_words = body_words
+        self.verbose = verbose
+        self.cancelled = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(parallel) if parallel > 0 else None
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        """The base URL to give the Ollama client."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def random(self) -> random.Random:
+        """Get a generator for one response, seeded from the server's generator."""
+        with self._lock:
+            return random.Random(self._rng.random())
+    
+    def fail(self) -> bool:
+        """Decide whether the current request fails."""
+        with self._lock:
+            return self._rng.random() < self.error_rate
+    
+    def request_latency(self) -> float:
+        """Get the latency of one request, including jitter."""
+        with self._lock:
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+    
+    def count_cancelled(self):
+        with self._lock:
+            self.cancelled += 1
+    
+    def start(self) -> "MockOllamaServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-ollama", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+def main():
+    """Run the mock server until interrupted."""
+    parser = argparse.ArgumentParser(description="Mock Ollama server for testing and benchmarking")
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST, help=f"Address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before the first token of each generation (default: 0.2)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random seconds added to or taken from the latency (default: 0)")
+    parser.add_argument("--token-rate", type=float, default=50.0, help="Tokens generated per second, 0 to answer at once (default: 50)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail with HTTP 500 (default: 0)")
+    parser.add_argument("--parallel", type=int, default=0, help="Generations processed at once, further requests queue; 0 for no limit (default: 0)")
+    parser.add_argument("--models", type=str, default=",".join(DEFAULT_MODELS), help="Comma-separated model names to serve")
+    parser.add_argument("--body-words", type=int, default=300, help="Approximate words per idea after the description (default: 300)")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible ideas and errors")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+    
+    if not (0.0 <= args.error_rate <= 1.0):
+        print("Error rate must be between 0.0 and 1.0")
+        return
+    
+    server = MockOllamaServer(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                              token_rate=args.token_rate, error_rate=args.error_rate, parallel=args.parallel,
+                              models=[name.strip() for name in args.models.split(",") if name.strip()],
+                              body_words=args.body_words, seed=args.seed, verbose=args.verbose)
+    print(f"Mock Ollama server listening on {server.url}")
+    print(f"Use it with: OLLAMA_HOST={server.url} python generate_agent_ideas.py 10 --model {server.models[0]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
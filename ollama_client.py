@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Ollama Client for AI Agent Ideation Generator
+
+This module provides a shared HTTP client for the Ollama API. It keeps a pool of
+persistent keep-alive connections so concurrent generations from the CLI, the GUI
+and the web viewer reuse TCP connections instead of opening one per request.
+"""
+
+import os
+import json
+import threading
+from typing import List, Dict, Any, Optional, Iterator
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Constants
+OLLAMA_BASE_URL = os.environ.get("OLLAMA_HOST", "http://localhost:11434")  # e.g. a mock_ollama.py server
+DEFAULT_OLLAMA_PORT = 11434
+REQUEST_TIMEOUT = 60  # Timeout for Ollama API requests in seconds
+DEFAULT_POOL_SIZE = 32  # Maximum number of pooled connections to the Ollama server
+
+# Token counts and durations (in nanoseconds) reported in the final response of a generation
+RESPONSE_STATS_FIELDS = [
+    "prompt_eval_count", "prompt_eval_duration", "eval_count", "eval_duration", "load_duration", "total_duration"
+]
+
+class OllamaError(Exception):
+    """Raised when the Ollama API returns an error response."""
+    
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Ollama API error: {status_code} - {message}")
+        self.status_code = status_code
+        self.message = message
+
+def normalize_base_url(value: str) -> str:
+    """Turn an OLLAMA_HOST style value into a base URL.
+    
+    Like the Ollama CLI, a bare host or host:port (e.g. "0.0.0.0" or "gpu-box:11500")
+    gets http:// and, without a port, Ollama's default port 11434. Values that already
+    have a scheme are used as given.
+    """
+    value = value.strip().rstrip('/')
+    if "://" in value:
+        return value
+    url = f"http://{value}"
+    try:
+        has_port = urlsplit(url).port is not None
+    except ValueError:
+        has_port = False
+    return url if has_port else f"{url}:{DEFAULT_OLLAMA_PORT}"
+
+def response_stats(response: Dict[str, Any]) -> Dict[str, Optional[int]]:
+    """Get the token counts and durations of a generation response (None for missing fields)."""
+    return {field: response.get(field) for field in RESPONSE_STATS_FIELDS}
+
+def parse_keep_alive(value: Optional[str]):
+    """Convert a keep_alive setting to the form the API expects.
+    
+    Durations such as "30m" are passed through; plain numbers become seconds, and a
+    negative number keeps the model loaded indefinitely.
+    """
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+def generate_payload(model: str, prompt: str, stream: bool, options: Optional[Dict[str, Any]] = None,
+                     system: Optional[str] = None, keep_alive=None) -> Dict[str, Any]:
+    """Build the body of a /api/generate request."""
+    payload = {
+        "model": model,
+        "prompt": prompt,
+        "stream": stream,
+        "options": options or {}
+    }
+    if system is not None:
+        payload["system"] = system
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    return payload
+
+class OllamaClient:
+    """Thread-safe Ollama API client backed by a pooled requests session."""
+    
+    def __init__(self, base_url: Optional[str] = None, pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: float = REQUEST_TIMEOUT):
+        """Initialize the client.
+        
+        Args:
+            base_url: The base URL of the Ollama server (None to use OLLAMA_BASE_URL as it
+                is at the time of each request, so the shared client follows changes to it)
+            pool_size: Maximum number of keep-alive connections to keep open
+            timeout: Default timeout for generation requests in seconds
+        """
+        self._base_url = base_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+    
+    @property
+    def base_url(self) -> str:
+        """The base URL requests are sent to."""
+        return normalize_base_url(self._base_url or OLLAMA_BASE_URL)
+    
+    def url(self, path: str) -> str:
+        """Build the full URL for an API path."""
+        return f"{self.base_url}{path}"
+    
+    def _check(self, response: requests.Response):
+        """Raise an OllamaError for a non-200 response."""
+        if response.status_code != 200:
+            raise OllamaError(response.status_code, response.text)
+    
+    def generate(self, model: str, prompt: str, options: Optional[Dict[str, Any]] = None,
+                 timeout: Optional[float] = None, system: Optional[str] = None, keep_alive=None) -> Dict[str, Any]:
+        """Run a non-streaming generation and return the full response body.
+        
+        Args:
+            system: System prompt that replaces the model's default one
+            keep_alive: How long the model stays loaded after the request (see parse_keep_alive)
+        """
+        response = self.session.post(
+            self.url("/api/generate"),
+            json=generate_payload(model, prompt, False, options, system, keep_alive),
+            timeout=timeout or self.timeout
+        )
+        self._check(response)
+        return response.json()
+    
+    def generate_stream(self, model: str, prompt: str, options: Optional[Dict[str, Any]] = None,
+                        timeout: Optional[float] = None, system: Optional[str] = None,
+                        keep_alive=None) -> Iterator[Dict[str, Any]]:
+        """Run a streaming generation and yield each response chunk as it arrives.
+        
+        The timeout applies between chunks rather than to the whole response. Closing
+        the generator early closes the connection, which makes Ollama cancel the request.
+        """
+        response = self.session.post(
+            self.url("/api/generate"),
+            json=generate_payload(model, prompt, True, options, system, keep_alive),
+            timeout=timeout or self.timeout,
+            stream=True
+        )
+        try:
+            self._check(response)
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+        finally:
+            response.close()
+    
+    def embed(self, model: str, text: str, timeout: Optional[float] = None) -> List[float]:
+        """Get the embedding vector of a text."""
+        response = self.session.post(
+            self.url("/api/embeddings"),
+            json={"model": model, "prompt": text},
+            timeout=timeout or self.timeout
+        )
+        self._check(response)
+        return response.json()["embedding"]
+    
+    def list_models(self, timeout: float = 10) -> List[Dict[str, Any]]:
+        """Return the models available on the Ollama server."""
+        response = self.session.get(self.url("/api/tags"), timeout=timeout)
+        self._check(response)
+        return response.json().get("models", [])
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_ollama_client() -> OllamaClient:
+    """Get the process-wide shared Ollama client, creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = OllamaClient()
+        return _client
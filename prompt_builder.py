@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Prompt Builder for AI Agent Ideation Generator
+
+This module turns a category and creativity level into the prompt sent to Ollama.
+The Jinja2 prompt is compiled once per process, idea templates are read from the
+templates folder once (and again only if the file changes), and each rendered prompt
+is cached per (category, creativity level). Identical requests therefore always send
+byte-identical prompts, which also lets the model server reuse its cache.
+
+The "classic" layout opens with the category and creativity level. The "prefix" and
+"system" layouts put the instructions and template, which are the same for every
+request, first (or in the system prompt) and the per-request variables last, so the
+model server can reuse the cached prefix and only process the short tail.
+"""
+
+import os
+import sys
+import threading
+from typing import List, Dict, Optional, Tuple
+
+# Check if Jinja2 is installed, if not install it
+try:
+    import jinja2
+except ImportError:
+    import subprocess
+    print("Installing required packages...")
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "jinja2"])
+    import jinja2
+
+# Constants
+REPO_PATH = os.path.dirname(os.path.abspath(__file__))
+TEMPLATES_DIR = os.path.join(REPO_PATH, "templates")
+DEFAULT_TEMPLATE = "template.md"
+PROMPT_LAYOUTS = ["classic", "prefix", "system"]
+DEFAULT_PROMPT_LAYOUT = "classic"
+
+CREATIVITY_INSTRUCTIONS = {
+    "basic": "Create a straightforward, practical, and conventional assistant idea. Focus on solving a common problem in a reliable way without being particularly novel or imaginative.",
+    "moderate": "Create a somewhat creative assistant idea that improves upon existing solutions with some innovative elements.",
+    "creative": "Create an original and imaginative assistant idea that approaches the problem in a novel way.",
+    "highly_creative": "Create an extremely innovative, even quirky or unconventional assistant idea that reimagines how this category could be approached. Don't be afraid to be ambitious, surprising, or even slightly humorous."
+}
+
+PROMPT_TEMPLATE = """
+You are an AI Agent Ideation Assistant. Your task is to generate a {{ creativity_level }} idea for an AI assistant within the category: {{ category }}.
+
+CREATIVITY LEVEL: {{ creativity_level }}
+{{ creativity_instructions }}
+
+IMPORTANT: Do NOT create a generic assistant that covers the entire category. Instead, focus on a very specific niche, use case, or problem within that category.
+
+For example:
+- Instead of a general "Cooking Assistant", create something like "SousVide Master" - an assistant specifically for sous vide cooking techniques
+- Instead of a general "Productivity Assistant", create something like "Meeting Summarizer Pro" - an assistant that specifically creates actionable summaries from meeting transcripts
+- Instead of a general "Travel Assistant", create something like "Solo Female Traveler Safety Guide" - an assistant focused on safety tips for women traveling alone
+
+Your idea should be:
+1. Highly specific and focused on a particular niche within the category
+2. Original and creative - not an obvious or common assistant concept
+3. Practical and solve a real problem for users
+4. Have a catchy, memorable name that clearly indicates its specific purpose
+
+Here's the template to fill out:
+
+{{ template }}
+
+Generate a complete, detailed, and creative AI assistant idea for a specific niche within the {{ category }} category. Be specific, original, and provide concrete examples.
+"""
+
+# Invariant part of the prefix-friendly layouts: identical for every request with the same template
+INSTRUCTIONS_TEMPLATE = """
+You are an AI Agent Ideation Assistant. Your task is to generate an idea for an AI assistant within the category and at the creativity level given at the end of these instructions.
+
+IMPORTANT: Do NOT create a generic assistant that covers the entire category. Instead, focus on a very specific niche, use case, or problem within that category.
+
+For example:
+- Instead of a general "Cooking Assistant", create something like "SousVide Master" - an assistant specifically for sous vide cooking techniques
+- Instead of a general "Productivity Assistant", create something like "Meeting Summarizer Pro" - an assistant that specifically creates actionable summaries from meeting transcripts
+- Instead of a general "Travel Assistant", create something like "Solo Female Traveler Safety Guide" - an assistant focused on safety tips for women traveling alone
+
+Your idea should be:
+1. Highly specific and focused on a particular niche within the category
+2. Original and creative - not an obvious or common assistant concept
+3. Practical and solve a real problem for users
+4. Have a catchy, memorable name that clearly indicates its specific purpose
+
+Here's the template to fill out:
+
+{{ template }}
+"""
+
+# Per-request part of the prefix-friendly layouts
+REQUEST_TEMPLATE = """
+CATEGORY: {{ category }}
+CREATIVITY LEVEL: {{ creativity_level }}
+{{ creativity_instructions }}
+
+Generate a complete, detailed, and creative AI assistant idea for a specific niche within the {{ category }} category. Be specific, original, and provide concrete examples.
+"""
+
+# Compiled once; Jinja2 templates are safe to render from several threads
+_ENV = jinja2.Environment(
+    loader=jinja2.BaseLoader(),
+    trim_blocks=True,
+    lstrip_blocks=True
+)
+_PROMPT = _ENV.from_string(PROMPT_TEMPLATE)
+_INSTRUCTIONS = _ENV.from_string(INSTRUCTIONS_TEMPLATE)
+_REQUEST = _ENV.from_string(REQUEST_TEMPLATE)
+
+def available_templates() -> List[str]:
+    """Get the file names of the idea templates in the templates folder."""
+    try:
+        return sorted(name for name in os.listdir(TEMPLATES_DIR) if name.endswith('.md'))
+    except OSError:
+        return []
+
+_templates: Dict[str, Tuple[float, str]] = {}  # Path -> (mtime, text)
+_templates_lock = threading.Lock()
+
+def load_template(name: Optional[str] = None) -> str:
+    """Read an idea template, reusing the cached text while the file is unchanged.
+    
+    Args:
+        name: File name in the templates folder (defaults to template.md)
+    
+    Raises:
+        OSError: If the template cannot be read
+    """
+    path = os.path.join(TEMPLATES_DIR, os.path.basename(name or DEFAULT_TEMPLATE))
+    mtime = os.stat(path).st_mtime
+    with _templates_lock:
+        cached = _templates.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+    
+    with open(path, 'r') as f:
+        template = f.read()
+    with _templates_lock:
+        _templates[path] = (mtime, template)
+    return template
+
+class PromptBuilder:
+    """Renders and caches the prompts of one idea template."""
+    
+    def __init__(self, template: str):
+        self.template = template
+        self.instructions = _INSTRUCTIONS.render(template=template).strip()
+        self._prompts: Dict[Tuple[str, str, str], str] = {}
+        self._lock = threading.Lock()
+    
+    def system(self, layout: str = DEFAULT_PROMPT_LAYOUT) -> Optional[str]:
+        """Get the system prompt of a layout (None if the layout does not use one)."""
+        return self.instructions if layout == "system" else None
+    
+    def build(self, category: str, creativity_level: str, layout: str = DEFAULT_PROMPT_LAYOUT) -> str:
+        """Get the prompt for a category and creativity level.
+        
+        Args:
+            category: The category of the idea
+            creativity_level: The creativity level of the idea
+            layout: "classic", "prefix" or "system" (send system() as the system prompt)
+        """
+        if layout not in PROMPT_LAYOUTS:
+            raise ValueError(f"Unknown prompt layout: {layout}")
+        
+        key = (category, creativity_level, layout)
+        with self._lock:
+            prompt = self._prompts.get(key)
+        if prompt is not None:
+            return prompt
+        
+        variables = {
+            "category": category,
+            "creativity_level": creativity_level.replace('_', ' '),
+            "creativity_instructions": CREATIVITY_INSTRUCTIONS[creativity_level]
+        }
+        if layout == "classic":
+            prompt = _PROMPT.render(template=self.template, **variables)
+        elif layout == "prefix":
+            prompt = f"{self.instructions}\n\n{_REQUEST.render(**variables).strip()}\n"
+        else:
+            prompt = _REQUEST.render(**variables).strip() + "\n"
+        with self._lock:
+            self._prompts[key] = prompt
+        return prompt
+
+_builders: Dict[str, PromptBuilder] = {}
+_builders_lock = threading.Lock()
+
+def get_prompt_builder(template: str) -> PromptBuilder:
+    """Get the process-wide shared prompt builder for a template, creating it on first use."""
+    with _builders_lock:
+        if template not in _builders:
+            _builders[template] = PromptBuilder(template)
+        return _builders[template]
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Retry Policy for AI Agent Ideation Generator
+
+This module provides the one retry policy that all Ollama generation requests go
+through, shared by every engine in the process. Transient failures (connection
+errors, timeouts, 429 and 5xx responses) are retried with exponential backoff and
+full jitter, so parallel requests that failed together do not retry in lockstep.
+Retries are paid for from a global budget that refills as requests are made, which
+keeps a struggling server from being hit with a multiple of the normal load. After
+a run of consecutive failures the circuit breaker opens and requests fail at once
+with CircuitOpenError instead of waiting out timeouts against a server that is
+down; after a cooldown one trial request is let through to see if it is back.
+"""
+
+import time
+import random
+import threading
+from typing import Callable, Optional, TypeVar
+
+import requests
+
+from ollama_client import OllamaError
+
+# Constants
+DEFAULT_MAX_ATTEMPTS = 3  # Attempts per request, including the first
+DEFAULT_BASE_DELAY = 1.0  # Backoff before the first retry is up to this many seconds
+DEFAULT_MAX_DELAY = 20.0  # Upper bound on any single backoff in seconds
+RETRY_BUDGET_RATIO = 0.2  # Retries earned per request, i.e. at most ~20% extra load
+RETRY_BUDGET_CAPACITY = 10.0  # Retries that can be spent in a burst
+CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failed attempts that open the circuit
+CIRCUIT_RESET_TIMEOUT = 30.0  # Seconds the circuit stays open before a trial request
+
+T = TypeVar("T")
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while the circuit breaker is open."""
+    
+    def __init__(self, retry_in: float):
+        super().__init__(f"Ollama appears to be down; not sending requests for another {retry_in:.0f} seconds")
+        self.retry_in = retry_in
+
+def is_transient(error: Exception) -> bool:
+    """Whether a request failure is worth retrying (the server may answer differently next time)."""
+    if isinstance(error, OllamaError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                              requests.exceptions.ChunkedEncodingError))
+
+def is_client_error(error: Exception) -> bool:
+    """Whether Ollama rejected the request itself (e.g. an unknown model), so sending it again cannot help."""
+    return isinstance(error, OllamaError) and 400 <= error.status_code < 500 and error.status_code != 429
+
+class RetryPolicy:
+    """Jittered exponential backoff with a global retry budget and a circuit breaker."""
+    
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, budget_ratio: float = RETRY_BUDGET_RATIO,
+                 budget_capacity: float = RETRY_BUDGET_CAPACITY,
+                 failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        """Initialize the policy.
+        
+        Args:
+            max_attempts: Attempts per request, including the first
+            base_delay: Backoff cap in seconds before the first retry; it doubles with each retry
+            max_delay: Upper bound on any single backoff in seconds
+            budget_ratio: Retries added to the budget for every request made
+            budget_capacity: Most retries the budget can hold (and what it starts with)
+            failure_threshold: Consecutive transient failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial request is allowed
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_capacity = budget_capacity
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._budget = budget_capacity
+        self._failures = 0  # Consecutive transient failures
+        self._opened_at: Optional[float] = None  # When the circuit opened (None while closed)
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def backoff(self, retry: int) -> float:
+        """Get a random backoff in seconds before the given retry (1 for the first)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+    
+    def _before_attempt(self) -> bool:
+        """Check the circuit before sending a request.
+        
+        Returns:
+            True if the attempt is the trial request of a half-open circuit
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            waited = time.monotonic() - self._opened_at
+            if waited < self.reset_timeout or self._trial_in_flight:
+                raise CircuitOpenError(max(0.0, self.reset_timeout - waited))
+            self._trial_in_flight = True
+            return True
+    
+    def _record(self, trial: bool, error: Optional[Exception] = None):
+        """Update the circuit with the outcome of an attempt."""
+        with self._lock:
+            if trial:
+                self._trial_in_flight = False
+            if error is None or not is_transient(error):
+                # Any answer, even a client error, shows the server is up
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if trial or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+    
+    def _withdraw_retry(self) -> bool:
+        """Take one retry from the budget, if there is one."""
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            return True
+    
+    def call(self, request: Callable[[], T], stop_event: Optional[threading.Event] = None,
+             on_retry: Optional[Callable[[int, float, Exception], None]] = None) -> T:
+        """Send a request, retrying transient failures.
+        
+        Args:
+            request: Function that sends the request and returns its result
+            stop_event: Event that cancels any remaining retries when set
+            on_retry: Callback called as on_retry(retry, delay, error) before each retry
+        
+        Returns:
+            The result of the first successful attempt
+        
+        Raises:
+            CircuitOpenError: If the circuit is open
+            Exception: The error of the last attempt, if no attempt succeeded
+        """
+        with self._lock:
+            self._budget = min(self.budget_capacity, self._budget + self.budget_ratio)
+        
+        attempt = 1
+        while True:
+            trial = self._before_attempt()
+            try:
+                result = request()
+            except Exception as e:
+                self._record(trial, e)
+                if (not is_transient(e) or attempt >= self.max_attempts or
+                        (stop_event is not None and stop_event.is_set()) or not self._withdraw_retry()):
+                    raise
+                delay = self.backoff(attempt)
+                if on_retry is not None:
+                    on_retry(attempt, delay, e)
+                if stop_event is not None:
+                    if stop_event.wait(delay):
+                        raise
+                else:
+                    time.sleep(delay)
+                attempt += 1
+            else:
+                self._record(trial)
+                return result
+
+_policy = None
+_policy_lock = threading.Lock()
+
+def get_retry_policy() -> RetryPolicy:
+    """Get the process-wide retry policy, creating it on first use."""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = RetryPolicy()
+        return _policy
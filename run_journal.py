@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Run Journal for AI Agent Ideation Generator
+
+This module checkpoints batch generation runs to runs/<run-id>.json: the run
+parameters, the target count, overall and per-category counters, the requests that
+were in flight and the ones that failed. The journal is rewritten atomically after
+every event, so a run that crashes or is stopped with Ctrl+C can be resumed with
+--resume <run-id> and only generates the ideas that are still missing.
+"""
+
+import os
+import json
+import uuid
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+# Constants
+REPO_PATH = os.path.dirname(os.path.abspath(__file__))
+RUNS_DIR = os.path.join(REPO_PATH, "runs")
+MAX_FAILED_ITEMS = 100  # Failed requests kept in the journal
+
+def _now() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+class RunJournal:
+    """Persistent state of one batch generation run."""
+    
+    def __init__(self, path: str, data: Dict[str, Any]):
+        self.path = path
+        self.data = data
+    
+    @classmethod
+    def create(cls, params: Dict[str, Any], target: int, runs_dir: Optional[str] = None) -> "RunJournal":
+        """Start the journal of a new run.
+        
+        Args:
+            params: The generation parameters needed to continue the run
+            target: Number of ideas the run should generate
+            runs_dir: Folder of the journals (defaults to runs/ in the repository)
+        """
+        runs_dir = runs_dir or RUNS_DIR
+        os.makedirs(runs_dir, exist_ok=True)
+        
+        run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        journal = cls(os.path.join(runs_dir, f"{run_id}.json"), {
+            "run_id": run_id,
+            "status": "running",
+            "created_at": _now(),
+            "updated_at": _now(),
+            "target": target,
+            "params": params,
+            "stats": {"attempts": 0, "generated": 0, "skipped": 0, "errors": 0},
+            "categories": {},
+            "pending": {},
+            "failed": []
+        })
+        journal.save()
+        return journal
+    
+    @classmethod
+    def load(cls, run_id: str, runs_dir: Optional[str] = None) -> "RunJournal":
+        """Load the journal of an earlier run.
+        
+        Raises:
+            FileNotFoundError: If there is no journal for the run ID
+        """
+        if os.path.basename(run_id) != run_id:
+            raise FileNotFoundError(run_id)
+        path = os.path.join(runs_dir or RUNS_DIR, f"{run_id}.json")
+        with open(path, 'r') as f:
+            return cls(path, json.load(f))
+    
+    @property
+    def run_id(self) -> str:
+        return self.data["run_id"]
+    
+    @property
+    def params(self) -> Dict[str, Any]:
+        return self.data["params"]
+    
+    @property
+    def target(self) -> int:
+        return self.data["target"]
+    
+    @property
+    def generated(self) -> int:
+        return self.data["stats"]["generated"]
+    
+    @property
+    def remaining(self) -> int:
+        """Number of ideas still to generate."""
+        return max(0, self.target - self.generated)
+    
+    @property
+    def completed(self) -> bool:
+        return self.data["status"] == "completed"
+    
+    def take_unfinished(self) -> List[Tuple[str, Optional[str]]]:
+        """Remove and return the (category, creativity level) of requests that were in
+        flight or failed when the run stopped, so a resumed run can request them first."""
+        items = list(self.data["pending"].values()) + self.data["failed"]
+        self.data["pending"] = {}
+        self.data["failed"] = []
+        return [(item["category"], item.get("creativity_level")) for item in items]
+    
+    def record(self, event: str, data: Dict[str, Any]):
+        """Record a generation engine event and checkpoint the journal.
+        
+        Args:
+            event: The engine event ("started", "generated", "skipped", "error" or "finished")
+            data: The event data
+        """
+        if event == "finished":
+            return
+        
+        stats = self.data["stats"]
+        attempt = str(data.get("attempt"))
+        
+        if event == "started":
+            stats["attempts"] += 1
+            self.data["pending"][attempt] = {
+                "category": data["category"],
+                "creativity_level": data.get("creativity_level")
+            }
+        else:
+            self.data["pending"].pop(attempt, None)
+            counter = {"generated": "generated", "skipped": "skipped", "error": "errors"}[event]
+            stats[counter] += 1
+            category = self.data["categories"].setdefault(data["category"], {"generated": 0, "skipped": 0, "errors": 0})
+            category[counter] += 1
+            
+            if event == "error":
+                self.data["failed"].append({
+                    "category": data["category"],
+                    "creativity_level": data.get("creativity_level"),
+                    "error": data.get("error"),
+                    "time": _now()
+                })
+                del self.data["failed"][:-MAX_FAILED_ITEMS]
+        
+        self.save()
+    
+    def finish(self, status: str):
+        """Mark the run as "completed", "stopped" or "failed" and save the journal."""
+        self.data["status"] = status
+        self.save()
+    
+    def save(self):
+        """Write the journal to disk atomically."""
+        self.data["updated_at"] = _now()
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.data, f, indent=2)
+        os.replace(tmp_path, self.path)
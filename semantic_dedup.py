@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Semantic Deduplication for AI Agent Ideation Generator
+
+This module catches ideas that are worded differently but mean the same thing. The
+assistant name and short description of each idea are embedded with a local Ollama
+embedding model, kept as rows of a normalised NumPy matrix persisted next to ideas.db,
+and a new idea is compared against all of them with a single matrix-vector product.
+"""
+
+import os
+import json
+import threading
+from typing import List, Dict, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ollama_client import get_ollama_client
+from similarity_index import extract_name_and_description
+
+# Constants
+REPO_PATH = os.path.dirname(os.path.abspath(__file__))
+EMBEDDINGS_FILE = os.path.join(REPO_PATH, "ideas_embeddings.npy")
+EMBEDDINGS_KEYS_FILE = os.path.join(REPO_PATH, "ideas_embeddings.json")
+DEFAULT_EMBEDDING_MODEL = "nomic-embed-text"
+DEFAULT_SEMANTIC_THRESHOLD = 0.92  # Cosine similarity above which ideas count as duplicates
+SAVE_INTERVAL = 50  # Persist the store after this many new vectors
+
+SEMANTIC_DEDUP_AVAILABLE = np is not None
+
+def embedding_text(idea: str) -> str:
+    """Get the text that represents an idea for embedding."""
+    name, description = extract_name_and_description(idea)
+    if name is None and description is None:
+        return idea[:1000]
+    return f"{name or ''}\n{description or ''}".strip()
+
+class EmbeddingStore:
+    """Normalised embedding vectors of ideas, persisted as a .npy matrix plus a JSON key list."""
+    
+    def __init__(self, model: str, matrix_path: Optional[str] = None, keys_path: Optional[str] = None):
+        if np is None:
+            raise RuntimeError("NumPy is required for semantic deduplication (pip install numpy)")
+        
+        self.model = model
+        self.matrix_path = matrix_path or EMBEDDINGS_FILE
+        self.keys_path = keys_path or EMBEDDINGS_KEYS_FILE
+        self.keys: List[str] = []  # Idea file paths relative to the categories folder
+        self._key_set = set()
+        self._folder_ids: Dict[str, int] = {}
+        self._matrix = None  # Row capacity grows by doubling; only the first len(keys) rows are used
+        self._folders = None  # Folder id of each row
+        self._unsaved = 0
+        self.load()
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._key_set
+    
+    def _folder_id(self, key: str) -> int:
+        """Get the numeric id of the category folder of a key."""
+        folder = key.split('/', 1)[0]
+        if folder not in self._folder_ids:
+            self._folder_ids[folder] = len(self._folder_ids)
+        return self._folder_ids[folder]
+    
+    def load(self):
+        """Load the store from disk. A store built with a different model is discarded."""
+        if not (os.path.exists(self.matrix_path) and os.path.exists(self.keys_path)):
+            return
+        
+        try:
+            with open(self.keys_path, 'r') as f:
+                meta = json.load(f)
+            if meta.get("model") != self.model:
+                print(f"Embedding store was built with {meta.get('model')}, rebuilding for {self.model}")
+                return
+            
+            matrix = np.load(self.matrix_path)
+            keys = meta["keys"]
+            if len(keys) != matrix.shape[0]:
+                print("Embedding store is inconsistent, rebuilding")
+                return
+        except Exception as e:
+            print(f"Error loading embedding store: {str(e)}")
+            return
+        
+        self._matrix = matrix.astype(np.float32)
+        self.keys = list(keys)
+        self._key_set = set(keys)
+        self._folders = np.array([self._folder_id(key) for key in keys], dtype=np.int32)
+    
+    def save(self):
+        """Write the store to disk atomically."""
+        if not self.keys:
+            return
+        
+        matrix_tmp = self.matrix_path + ".tmp.npy"
+        keys_tmp = self.keys_path + ".tmp"
+        np.save(matrix_tmp, self._matrix[:len(self.keys)])
+        with open(keys_tmp, 'w') as f:
+            json.dump({"model": self.model, "keys": self.keys}, f)
+        os.replace(matrix_tmp, self.matrix_path)
+        os.replace(keys_tmp, self.keys_path)
+        self._unsaved = 0
+    
+    def add(self, key: str, vector):
+        """Add the normalised vector of an idea."""
+        if key in self._key_set:
+            return
+        
+        size = len(self.keys)
+        if self._matrix is None:
+            self._matrix = np.zeros((64, vector.shape[0]), dtype=np.float32)
+            self._folders = np.zeros(64, dtype=np.int32)
+        elif size == self._matrix.shape[0]:
+            self._matrix = np.concatenate([self._matrix, np.zeros_like(self._matrix)])
+            self._folders = np.concatenate([self._folders, np.zeros_like(self._folders)])
+        
+        self._matrix[size] = vector
+        self._folders[size] = self._folder_id(key)
+        self.keys.append(key)
+        self._key_set.add(key)
+        
+        self._unsaved += 1
+        if self._unsaved >= SAVE_INTERVAL:
+            self.save()
+    
+    def max_similarity(self, vector, folder: Optional[str] = None) -> float:
+        """Get the highest cosine similarity between the vector and the stored vectors.
+        
+        Args:
+            vector: The normalised vector to compare
+            folder: Only compare against ideas in this category folder (None for all)
+        """
+        size = len(self.keys)
+        if size == 0:
+            return 0.0
+        
+        similarities = self._matrix[:size] @ vector
+        if folder is not None:
+            folder_id = self._folder_ids.get(folder)
+            if folder_id is None:
+                return 0.0
+            similarities = similarities[self._folders[:size] == folder_id]
+            if similarities.size == 0:
+                return 0.0
+        
+        return float(similarities.max())
+
+class SemanticDeduplicator:
+    """Embedding-based duplicate detection over the ideas in the categories folder."""
+    
+    def __init__(self, categories_dir: str, model: str = DEFAULT_EMBEDDING_MODEL):
+        self.categories_dir = categories_dir
+        self.model = model
+        self.store = EmbeddingStore(model)
+        self._folder_mtimes: Dict[str, float] = {}
+        self._lock = threading.RLock()
+    
+    def embed(self, idea: str):
+        """Embed an idea and return its normalised vector."""
+        vector = np.asarray(get_ollama_client().embed(self.model, embedding_text(idea)), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+    
+    def key(self, file_path: str) -> str:
+        """Get the store key of an idea file."""
+        return os.path.relpath(file_path, self.categories_dir).replace(os.sep, '/')
+    
+    def sync_folder(self, folder_name: str):
+        """Embed the ideas of a category folder that are not in the store yet."""
+        category_folder = os.path.join(self.categories_dir, folder_name)
+        with self._lock:
+            try:
+                mtime = os.stat(category_folder).st_mtime
+            except OSError:
+                return
+            if self._folder_mtimes.get(folder_name) == mtime:
+                return
+            
+            for filename in sorted(os.listdir(category_folder)):
+                if not filename.endswith('.md') or filename == 'prompt.md':
+                    continue
+                file_path = os.path.join(category_folder, filename)
+                key = self.key(file_path)
+                if key in self.store:
+                    continue
+                try:
+                    with open(file_path, 'r') as f:
+                        self.store.add(key, self.embed(f.read()))
+                except Exception as e:
+                    print(f"Error embedding {file_path}: {str(e)}")
+            
+            self._folder_mtimes[folder_name] = mtime
+    
+    def sync_all(self):
+        """Embed every idea in the categories folder that is not in the store yet."""
+        if not os.path.exists(self.categories_dir):
+            return
+        for folder_name in sorted(os.listdir(self.categories_dir)):
+            if os.path.isdir(os.path.join(self.categories_dir, folder_name)):
+                self.sync_folder(folder_name)
+    
+    def prepare(self, folder_name: Optional[str] = None):
+        """Embed any stored ideas missing from the store for a folder (None for all folders)."""
+        if folder_name is None:
+            self.sync_all()
+        else:
+            self.sync_folder(folder_name)
+    
+    def is_duplicate(self, vector, threshold: float = DEFAULT_SEMANTIC_THRESHOLD,
+                     folder_name: Optional[str] = None) -> bool:
+        """Check whether an embedded idea is semantically similar to a stored idea.
+        
+        Args:
+            vector: The normalised vector of the new idea
+            threshold: Cosine similarity above which the idea is a duplicate
+            folder_name: Only compare against this category folder (None for all categories)
+        """
+        with self._lock:
+            self.prepare(folder_name)
+            return self.store.max_similarity(vector, folder_name) > threshold
+    
+    def add(self, file_path: str, vector):
+        """Record the vector of an idea that has just been saved."""
+        with self._lock:
+            self.store.add(self.key(file_path), vector)
+    
+    def save(self):
+        """Persist the embedding store."""
+        with self._lock:
+            self.store.save()
+
+_deduplicators: Dict[tuple, SemanticDeduplicator] = {}
+_deduplicators_lock = threading.Lock()
+
+def get_semantic_deduplicator(categories_dir: str, model: str = DEFAULT_EMBEDDING_MODEL) -> SemanticDeduplicator:
+    """Get the process-wide shared deduplicator for an embedding model, creating it on first use."""
+    with _deduplicators_lock:
+        key = (categories_dir, model)
+        if key not in _deduplicators:
+            _deduplicators[key] = SemanticDeduplicator(categories_dir, model)
+        return _deduplicators[key]
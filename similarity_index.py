@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Similarity Index for AI Agent Ideation Generator
+
+This module keeps a long-lived, in-memory index of the assistant name and short
+description of every idea, per category folder. Each folder is read from disk once;
+after that only files that appear later (written by this or another process) are read,
+so duplicate checks no longer re-read and re-parse the whole category on every attempt.
+
+Two similarity backends are available: "difflib" compares against every idea, and
+"minhash" uses MinHash + locality-sensitive hashing to find candidates first.
+"""
+
+import os
+import re
+import zlib
+import random
+import difflib
+import threading
+from collections import defaultdict
+from typing import List, Dict, Optional, Tuple
+
+NAME_PATTERN = re.compile(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n')
+DESCRIPTION_PATTERN = re.compile(r'## 2\. Short Description:\s*\n\s*(.+?)\s*\n')
+
+def extract_name_and_description(idea: str) -> Tuple[Optional[str], Optional[str]]:
+    """Extract the assistant name and the first line of the short description from an idea."""
+    name_match = NAME_PATTERN.search(idea)
+    desc_match = DESCRIPTION_PATTERN.search(idea)
+    return (name_match.group(1) if name_match else None,
+            desc_match.group(1) if desc_match else None)
+
+def _ratio_above(a: str, b: str, threshold: float) -> bool:
+    """Check whether SequenceMatcher.ratio() exceeds the threshold.
+    
+    real_quick_ratio() and quick_ratio() are cheap upper bounds of ratio(), so most
+    dissimilar pairs are rejected without running the full matching algorithm.
+    """
+    matcher = difflib.SequenceMatcher(None, a, b)
+    return (matcher.real_quick_ratio() > threshold and
+            matcher.quick_ratio() > threshold and
+            matcher.ratio() > threshold)
+
+def is_similar_entry(name: Optional[str], description: Optional[str],
+                     existing_name: Optional[str], existing_description: Optional[str],
+                     threshold: float) -> bool:
+    """Check whether two ideas are similar by their assistant names or by their short descriptions."""
+    if name and existing_name:
+        if _ratio_above(name, existing_name, threshold):
+            return True
+    
+    if description and existing_description:
+        if _ratio_above(description, existing_description, threshold):
+            return True
+    
+    return False
+
+class DifflibBackend:
+    """Exact backend: compares against every indexed entry (linear in the number of ideas)."""
+    
+    def __init__(self):
+        self.entries = []  # List of (name, description) tuples
+    
+    @classmethod
+    def query(cls, name: Optional[str], description: Optional[str]):
+        """Precompute what the backend needs to index or look up a pair.
+        
+        The result does not depend on the folder, so it is computed once per idea
+        (outside the index lock) and passed to every folder's backend.
+        """
+        return None
+    
+    def add(self, name: Optional[str], description: Optional[str], query=None):
+        """Index a (name, description) pair."""
+        self.entries.append((name, description))
+    
+    def candidates(self, name: Optional[str], description: Optional[str],
+                   query=None) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Get the entries that need an exact comparison."""
+        return self.entries
+    
+    def is_similar(self, name: Optional[str], description: Optional[str], threshold: float, query=None) -> bool:
+        """Check if the pair is similar to any indexed entry."""
+        for existing_name, existing_description in self.candidates(name, description, query):
+            if is_similar_entry(name, description, existing_name, existing_description, threshold):
+                return True
+        return False
+
+class MinHasher:
+    """MinHash signatures over character shingles, split into LSH bands."""
+    
+    PRIME = (1 << 31) - 1  # Small enough that a * h + b stays a machine-sized integer
+    
+    def __init__(self, bands: int = 20, rows: int = 3, shingle_size: int = 3, seed: int = 1):
+        self.bands = bands
+        self.rows = rows
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self.permutations = [(rng.randrange(1, self.PRIME), rng.randrange(0, self.PRIME))
+                             for _ in range(bands * rows)]
+    
+    def shingles(self, text: str) -> set:
+        """Get the set of character shingles of the normalised text."""
+        text = " ".join(text.lower().split())
+        if len(text) <= self.shingle_size:
+            return {text}
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+    
+    def band_keys(self, text: str) -> List[Tuple[int, Tuple[int, ...]]]:
+        """Get the LSH bucket key of each band of the text's MinHash signature."""
+        hashes = [zlib.crc32(shingle.encode('utf-8')) & self.PRIME for shingle in self.shingles(text)]
+        signature = [min([(a * h + b) % self.PRIME for h in hashes]) for a, b in self.permutations]
+        return [(band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+                for band in range(self.bands)]
+
+MINHASHER = MinHasher()
+
+class MinHashBackend(DifflibBackend):
+    """Sublinear backend: MinHash + locality-sensitive hashing picks candidates,
+    which are then confirmed with the same SequenceMatcher check as the exact backend.
+    
+    Pairs whose shingle sets barely overlap are never compared, so a few borderline
+    near-duplicates can slip through in exchange for lookups that do not grow with
+    the size of the corpus.
+    """
+    
+    hasher = MINHASHER
+    
+    def __init__(self):
+        super().__init__()
+        self.name_buckets = defaultdict(list)
+        self.description_buckets = defaultdict(list)
+    
+    @classmethod
+    def query(cls, name: Optional[str], description: Optional[str]):
+        """Get the LSH band keys of the name and of the description."""
+        return (cls.hasher.band_keys(name) if name else [],
+                cls.hasher.band_keys(description) if description else [])
+    
+    def add(self, name: Optional[str], description: Optional[str], query=None):
+        """Index a (name, description) pair."""
+        name_keys, description_keys = query or self.query(name, description)
+        entry_id = len(self.entries)
+        super().add(name, description)
+        for key in name_keys:
+            self.name_buckets[key].append(entry_id)
+        for key in description_keys:
+            self.description_buckets[key].append(entry_id)
+    
+    def candidates(self, name: Optional[str], description: Optional[str],
+                   query=None) -> List[Tuple[Optional[str], Optional[str]]]:
+        """Get the entries sharing at least one LSH bucket with the pair."""
+        name_keys, description_keys = query or self.query(name, description)
+        entry_ids = set()
+        for key in name_keys:
+            entry_ids.update(self.name_buckets.get(key, ()))
+        for key in description_keys:
+            entry_ids.update(self.description_buckets.get(key, ()))
+        return [self.entries[entry_id] for entry_id in sorted(entry_ids)]
+
+SIMILARITY_BACKENDS = {
+    "difflib": DifflibBackend,
+    "minhash": MinHashBackend
+}
+DEFAULT_SIMILARITY_BACKEND = "difflib"
+
+class _FolderEntries:
+    """The indexed ideas of one category folder."""
+    
+    def __init__(self, backend):
+        self.files = set()
+        self.backend = backend
+        self.mtime = None
+
+class IdeaIndex:
+    """Thread-safe index of (name, description) pairs per category folder."""
+    
+    def __init__(self, backend: str = DEFAULT_SIMILARITY_BACKEND):
+        if backend not in SIMILARITY_BACKENDS:
+            raise ValueError(f"Unknown similarity backend: {backend}")
+        self.backend = backend
+        self._folders: Dict[str, _FolderEntries] = {}
+        self._lock = threading.RLock()
+    
+    def _refresh(self, category_folder: str) -> _FolderEntries:
+        """Load a folder on first use, then pick up files added since the last look."""
+        folder = self._folders.get(category_folder)
+        if folder is None:
+            folder = self._folders[category_folder] = _FolderEntries(SIMILARITY_BACKENDS[self.backend]())
+        
+        try:
+            mtime = os.stat(category_folder).st_mtime
+        except OSError:
+            return folder
+        
+        if mtime == folder.mtime:
+            return folder
+        
+        for filename in os.listdir(category_folder):
+            if not filename.endswith('.md') or filename == 'prompt.md' or filename in folder.files:
+                continue
+            
+            file_path = os.path.join(category_folder, filename)
+            try:
+                with open(file_path, 'r') as f:
+                    folder.backend.add(*extract_name_and_description(f.read()))
+                folder.files.add(filename)
+            except Exception as e:
+                print(f"Error reading file {file_path}: {str(e)}")
+        
+        folder.mtime = mtime
+        return folder
+    
+    def add(self, category_folder: str, file_path: str, idea: str):
+        """Record an idea that has just been written to a category folder."""
+        with self._lock:
+            folder = self._folders.get(category_folder)
+            if folder is None:
+                # Not loaded yet; the first lookup will read the new file from disk
+                return
+            
+            filename = os.path.basename(file_path)
+            if filename in folder.files:
+                return
+            folder.files.add(filename)
+        
+        # Hash outside the lock; the file is already claimed, so no other thread adds it
+        name, description = extract_name_and_description(idea)
+        query = SIMILARITY_BACKENDS[self.backend].query(name, description)
+        with self._lock:
+            folder.backend.add(name, description, query)
+    
+    def is_similar(self, category_folder: str, idea: str, threshold: float = 0.8) -> bool:
+        """Check if an idea is similar to any indexed idea in the category folder."""
+        name, description = extract_name_and_description(idea)
+        if name is None and description is None:
+            return False
+        query = SIMILARITY_BACKENDS[self.backend].query(name, description)
+        
+        with self._lock:
+            return self._refresh(category_folder).backend.is_similar(name, description, threshold, query)
+    
+    def is_similar_in_any(self, categories_dir: str, idea: str, threshold: float = 0.8) -> bool:
+        """Check if an idea is similar to any indexed idea in any category folder."""
+        name, description = extract_name_and_description(idea)
+        if name is None and description is None:
+            return False
+        
+        try:
+            folder_names = sorted(os.listdir(categories_dir))
+        except OSError:
+            return False
+        
+        # The query is the same for every folder, so hash it once
+        query = SIMILARITY_BACKENDS[self.backend].query(name, description)
+        
+        with self._lock:
+            for folder_name in folder_names:
+                category_folder = os.path.join(categories_dir, folder_name)
+                if not os.path.isdir(category_folder):
+                    continue
+                if self._refresh(category_folder).backend.is_similar(name, description, threshold, query):
+                    return True
+        
+        return False
+
+_indexes: Dict[str, IdeaIndex] = {}
+_index_lock = threading.Lock()
+
+def get_idea_index(backend: str = DEFAULT_SIMILARITY_BACKEND) -> IdeaIndex:
+    """Get the process-wide shared idea index for a similarity backend, creating it on first use."""
+    with _index_lock:
+        if backend not in _indexes:
+            _indexes[backend] = IdeaIndex(backend)
+        return _indexes[backend]
+
+def get_idea_indexes() -> List[IdeaIndex]:
+    """Get every idea index created so far in this process."""
+    with _index_lock:
+        return list(_indexes.values())
@@ -9,29 +9,29 @@ generated by the AI Agent Ideation Generator.
 import os
 import re
 import json
+import base64
 import sqlite3
 import threading
-import time
-import random
-import gc
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
-from collections import defaultdict
-import markdown
-from flask import Flask, render_template, request, redirect, url_for, abort, jsonify, Response
+from flask import Flask, render_template, request, redirect, url_for, abort, jsonify, Response, g, has_app_context
+from markupsafe import Markup, escape
 
 # Import the core functionality
 try:
     from generate_agent_ideas import (
-        load_categories, load_template, get_category_folder_name,
-        get_existing_ideas, is_similar_idea, generate_idea_with_ollama,
-        save_idea, get_available_models, update_index
+        load_categories, load_template, get_available_models,
+        GenerationEngine, DEFAULT_CONCURRENCY
     )
 except ImportError:
     print("Error importing core functionality. Make sure generate_agent_ideas.py is in the same directory.")
     import sys
     sys.exit(1)
 
+from idea_store import get_rendered_html, get_connection_pool
+from job_manager import JobManager
+from metrics import get_metrics, ACTIVE_JOBS
+
 # Constants
 REPO_PATH = os.path.dirname(os.path.abspath(__file__))
 CATEGORIES_DIR = os.path.join(REPO_PATH, "by-category")
@@ -39,70 +39,136 @@ INDEX_FILE = os.path.join(REPO_PATH, "index.md")
 TEMPLATES_DIR = os.path.join(REPO_PATH, "web_templates")
 DB_PATH = os.path.join(REPO_PATH, "ideas.db")
 DEFAULT_MODEL = "llama3.2"
-MAX_RETRIES = 3  # Maximum number of retries for failed generations
-RETRY_DELAY = 2  # Delay between retries in seconds
+PAGE_SIZE = 50  # Ideas per page on the index page
+MAX_PAGE_SIZE = 500
 
 # Create Flask app
 app = Flask(__name__, 
             template_folder=TEMPLATES_DIR,
             static_folder=os.path.join(TEMPLATES_DIR, "static"))
 
-# Global variables for idea generation
-generation_active = False
-generation_thread = None
-generation_stats = {
-    "total": 0,
-    "generated": 0,
-    "skipped": 0,
-    "errors": 0,
-    "log": []
-}
-generation_lock = threading.Lock()
+# Generation jobs started from the web interface
+job_manager = JobManager()
 
 def get_db_connection():
-    """Get a connection to the SQLite database."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get a pooled connection to the SQLite database.
+    
+    Inside a request the connection is shared by every query of that request and is
+    returned to the pool when the request ends; other threads use their own connection.
+    """
+    pool = get_connection_pool(DB_PATH)
+    if not has_app_context():
+        return pool.thread_connection()
+    
+    if 'db_conn' not in g:
+        g.db_conn = pool.acquire()
+        g.db_pool = pool
+    return g.db_conn
+
+@app.teardown_appcontext
+def release_db_connection(exception=None):
+    """Return the request's database connection to the pool."""
+    conn = g.pop('db_conn', None)
+    if conn is not None:
+        g.pop('db_pool').release(conn)
+
+SNIPPET_START = "\x02"  # Match markers used by snippet(), replaced after escaping
+SNIPPET_END = "\x03"
+
+def build_fts_query(search_query: str) -> str:
+    """Turn free text into an FTS5 query that prefix-matches every word."""
+    terms = re.findall(r'\w+', search_query)
+    return " ".join(f'"{term}"*' for term in terms)
+
+def render_snippet(snippet: Optional[str]) -> Optional[Markup]:
+    """Escape a search snippet and highlight its matches."""
+    if not snippet:
+        return None
+    html = str(escape(snippet))
+    return Markup(html.replace(SNIPPET_START, "<mark>").replace(SNIPPET_END, "</mark>"))
+
+def has_fts_index(conn) -> bool:
+    """Check whether the database has the full-text index created by db_setup."""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ideas_fts'").fetchone()
+    return row is not None
 
-def get_ideas_from_db(category_filter=None, search_query=None, sort_by="created_at", sort_order="desc", limit=None):
-    """Get ideas from the database with optional filtering and sorting."""
+def get_ideas_from_db(category_filter=None, search_query=None, sort_by="created_at", sort_order="desc", limit=None,
+                      after=None):
+    """Get ideas from the database with optional filtering and sorting.
+    
+    Searches use the FTS5 index over name, description and content, ranked by bm25
+    when sort_by is "relevance", and fall back to LIKE if the index is missing.
+    
+    Args:
+        category_filter: Only return ideas in this category
+        search_query: Free-text search query
+        sort_by: "created_at", "name", "category" or "relevance"
+        sort_order: "asc" or "desc"
+        limit: Maximum number of ideas to return
+        after: (sort_key, id) of the last idea of the previous page, for keyset pagination
+    """
     conn = get_db_connection()
     cursor = conn.cursor()
     
-    query = """
-    SELECT i.id, i.name, i.description, c.name as category, i.file_path, i.created_at
-    FROM ideas i
-    JOIN categories c ON i.category_id = c.id
-    """
+    fts_query = build_fts_query(search_query) if search_query else ""
+    use_fts = bool(fts_query) and has_fts_index(conn)
+    
+    # The sort key is returned with each idea so the caller can ask for the page after it
+    if sort_by == "relevance" and use_fts:
+        # bm25 scores are lower for better matches; names weigh most, then descriptions
+        sort_key = "bm25(ideas_fts, 10.0, 5.0, 1.0)"
+        sort_order = "asc" if sort_order == "desc" else "desc"
+    elif sort_by == "name":
+        sort_key = "i.name"
+    elif sort_by == "category":
+        sort_key = "c.name"
+    else:  # Default to date
+        sort_key = "i.created_at"
+    direction = "ASC" if sort_order.lower() == "asc" else "DESC"
+    
+    if use_fts:
+        query = f"""
+        SELECT i.id, i.name, c.name as category, i.file_path, i.created_at, {sort_key} as sort_key,
+               snippet(ideas_fts, -1, '{SNIPPET_START}', '{SNIPPET_END}', '...', 16) as snippet
+        FROM ideas_fts
+        JOIN ideas i ON i.id = ideas_fts.rowid
+        JOIN categories c ON i.category_id = c.id
+        """
+    else:
+        query = f"""
+        SELECT i.id, i.name, c.name as category, i.file_path, i.created_at, {sort_key} as sort_key,
+               NULL as snippet
+        FROM ideas i
+        JOIN categories c ON i.category_id = c.id
+        """
     
     params = []
     where_clauses = []
     
+    if use_fts:
+        where_clauses.append("ideas_fts MATCH ?")
+        params.append(fts_query)
+    elif search_query:
+        where_clauses.append("(i.name LIKE ? OR i.description LIKE ? OR c.name LIKE ?)")
+        search_term = f"%{search_query}%"
+        params.extend([search_term, search_term, search_term])
+    
     if category_filter:
         where_clauses.append("c.name = ?")
         params.append(category_filter)
     
-    if search_query:
-        where_clauses.append("(i.name LIKE ? OR i.description LIKE ? OR c.name LIKE ?)")
-        search_term = f"%{search_query}%"
-        params.extend([search_term, search_term, search_term])
+    if after:
+        where_clauses.append(f"({sort_key}, i.id) {'>' if direction == 'ASC' else '<'} (?, ?)")
+        params.extend(after)
     
     if where_clauses:
         query += " WHERE " + " AND ".join(where_clauses)
     
-    # Add sorting
-    if sort_by == "name":
-        query += " ORDER BY i.name"
-    elif sort_by == "category":
-        query += " ORDER BY c.name"
-    else:  # Default to date
-        query += " ORDER BY i.created_at"
-    
-    query += " " + sort_order.upper()
+    # Ties are broken by ID so that every idea has a unique position
+    query += f" ORDER BY {sort_key} {direction}, i.id {direction}"
     
     if limit:
-        query += f" LIMIT {limit}"
+        query += f" LIMIT {int(limit)}"
     
     cursor.execute(query, params)
     ideas = cursor.fetchall()
@@ -115,39 +181,108 @@ def get_ideas_from_db(category_filter=None, search_query=None, sort_by="created_
             'name': idea['name'],
             'category': idea['category'],
             'path': idea['file_path'],
-            'date': idea['created_at']
+            'date': idea['created_at'],
+            'sort_key': idea['sort_key'],
+            'snippet': render_snippet(idea['snippet'])
         })
     
-    conn.close()
     return result
 
-def get_categories_from_db():
-    """Get all categories from the database."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-    SELECT c.id, c.name, c.folder_name, COUNT(i.id) as idea_count
-    FROM categories c
-    LEFT JOIN ideas i ON c.id = i.category_id
-    GROUP BY c.id
-    ORDER BY c.name
-    """)
+def encode_cursor(idea: Dict[str, Any]) -> str:
+    """Encode the position of an idea as an opaque pagination cursor."""
+    payload = json.dumps([idea['sort_key'], idea['id']]).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii')
+
+def decode_cursor(cursor: str) -> Optional[Tuple[Any, int]]:
+    """Decode a pagination cursor, returning None if it is not valid."""
+    try:
+        sort_key, idea_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        return None
+    if not isinstance(idea_id, int) or not isinstance(sort_key, (str, int, float)):
+        return None
+    return sort_key, idea_id
+
+def get_ideas_page(category_filter=None, search_query=None, sort_by="created_at", sort_order="desc",
+                   cursor=None, page_size=None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Get one page of ideas and the cursor of the next page (None on the last page)."""
+    page_size = max(1, min(page_size or PAGE_SIZE, MAX_PAGE_SIZE))
+    ideas = get_ideas_from_db(
+        category_filter=category_filter,
+        search_query=search_query,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        limit=page_size + 1,
+        after=decode_cursor(cursor) if cursor else None
+    )
     
-    categories = cursor.fetchall()
+    next_cursor = None
+    if len(ideas) > page_size:
+        ideas = ideas[:page_size]
+        next_cursor = encode_cursor(ideas[-1])
+    return ideas, next_cursor
+
+class CategoryCache:
+    """In-memory copy of the category list, reloaded only after the database changes.
     
-    # Convert to list of dicts
-    result = []
-    for category in categories:
-        result.append({
-            'id': category['id'],
-            'name': category['name'],
-            'folder_name': category['folder_name'],
-            'count': category['idea_count']
-        })
+    A dedicated connection that never writes watches PRAGMA data_version, which
+    changes whenever another connection commits.
+    """
     
-    conn.close()
-    return result
+    def __init__(self):
+        self._categories = None
+        self._db_path = None
+        self._watch_conn = None
+        self._data_version = None
+        self._lock = threading.Lock()
+    
+    def _changed(self) -> bool:
+        """Check whether the database has been modified since the list was loaded."""
+        if self._watch_conn is None or self._db_path != DB_PATH:
+            if self._watch_conn is not None:
+                self._watch_conn.close()
+            self._db_path = DB_PATH
+            self._watch_conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+            self._data_version = None
+        
+        data_version = self._watch_conn.execute("PRAGMA data_version").fetchone()[0]
+        changed = data_version != self._data_version
+        self._data_version = data_version
+        return changed
+    
+    def get(self) -> List[Dict[str, Any]]:
+        """Get all categories with their idea counts."""
+        with self._lock:
+            if self._changed() or self._categories is None:
+                self._categories = self._load()
+            return self._categories
+    
+    def _load(self) -> List[Dict[str, Any]]:
+        """Read the category list and the maintained idea counts."""
+        cursor = get_db_connection().cursor()
+        cursor.execute("""
+        SELECT id, name, folder_name, idea_count
+        FROM categories
+        ORDER BY name
+        """)
+        
+        # Convert to list of dicts
+        result = []
+        for category in cursor.fetchall():
+            result.append({
+                'id': category['id'],
+                'name': category['name'],
+                'folder_name': category['folder_name'],
+                'count': category['idea_count']
+            })
+        
+        return result
+
+category_cache = CategoryCache()
+
+def get_categories_from_db():
+    """Get all categories from the database."""
+    return category_cache.get()
 
 def get_idea_from_db(idea_id=None, file_path=None):
     """Get a specific idea from the database by ID or file path."""
@@ -172,11 +307,11 @@ def get_idea_from_db(idea_id=None, file_path=None):
         return None
     
     idea = cursor.fetchone()
-    conn.close()
-    
     if not idea:
         return None
     
+    content_html = get_rendered_html(conn, idea['id'], idea['content'])
+    
     # Convert to dict
     result = {
         'id': idea['id'],
@@ -186,191 +321,92 @@ def get_idea_from_db(idea_id=None, file_path=None):
         'path': idea['file_path'],
         'date': idea['created_at'],
         'raw_content': idea['content'],
-        'content_html': markdown.markdown(idea['content'], extensions=['tables', 'fenced_code'])
+        'content_html': content_html
     }
     
     return result
 
-def save_idea_to_db(name, description, category, file_path, content):
-    """Save a new idea to the database."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Get category ID
-    cursor.execute("SELECT id FROM categories WHERE name = ?", (category,))
-    category_row = cursor.fetchone()
-    
-    if not category_row:
-        # Create category if it doesn't exist
-        folder_name = get_category_folder_name(category)
-        cursor.execute(
-            "INSERT INTO categories (name, folder_name) VALUES (?, ?)",
-            (category, folder_name)
-        )
-        category_id = cursor.lastrowid
-    else:
-        category_id = category_row['id']
+def get_adjacent_ideas(idea: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Get the ideas generated just before and just after an idea.
     
-    # Insert idea
-    cursor.execute(
-        """
-        INSERT INTO ideas (name, description, category_id, file_path, created_at, content)
-        VALUES (?, ?, ?, ?, ?, ?)
-        """,
-        (name, description, category_id, file_path, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), content)
-    )
+    Each neighbour is a single range query on the (created_at, id) index, so the cost
+    does not depend on the number of ideas.
     
-    idea_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    Returns:
+        (previous idea, next idea), either of which may be None
+    """
+    if idea.get('id') is None:
+        return None, None
     
-    return idea_id
+    position = (idea['date'], idea['id'])
+    older = get_ideas_from_db(sort_by="created_at", sort_order="desc", limit=1, after=position)
+    newer = get_ideas_from_db(sort_by="created_at", sort_order="asc", limit=1, after=position)
+    return (older[0] if older else None), (newer[0] if newer else None)
 
-def generate_ideas_thread(model, num_ideas, similarity_threshold, unlimited=False, specific_category=None):
-    """Thread function for generating AI agent ideas."""
-    global generation_active, generation_stats
+def run_generation_job(job):
+    """Generate the ideas of a job with the engine, reporting progress to the job."""
+    params = job.params
+    model = params['model']
     
-    # Reset stats
-    with generation_lock:
-        generation_stats["total"] = num_ideas if not unlimited else 0
-        generation_stats["generated"] = 0
-        generation_stats["skipped"] = 0
-        generation_stats["errors"] = 0
-        generation_stats["log"] = []
+    job.log(f"Starting generation with model: {model}")
+    job.log(f"Similarity threshold: {params['similarity_threshold']}")
+    job.log(f"Concurrent requests: {'up to ' if params.get('adaptive') else ''}{params['concurrency']}")
     
-    log_generation_message(f"Starting generation with model: {model}")
-    log_generation_message(f"Similarity threshold: {similarity_threshold}")
-    
-    if specific_category:
-        log_generation_message(f"Generating ideas for category: {specific_category}")
+    if params['specific_category']:
+        job.log(f"Generating ideas for category: {params['specific_category']}")
     else:
-        log_generation_message("Generating ideas across all categories")
+        job.log("Generating ideas across all categories")
     
     # Load categories
     categories = load_categories()
     if not categories:
-        log_generation_message("Error: No categories found")
-        generation_active = False
-        return
+        raise RuntimeError("No categories found")
     
     # Load template
     template = load_template()
     if not template:
-        log_generation_message("Error: Template not found")
-        generation_active = False
-        return
-    
-    # Get existing ideas for similarity check
-    existing_ideas = get_existing_ideas()
+        raise RuntimeError("Template not found")
     
     # Extract just the model name string if it's a dictionary
     if isinstance(model, dict) and 'model' in model:
         model = model['model']
     
-    # Generate ideas
-    count = 0
-    while (count < num_ideas or unlimited) and generation_active:
-        try:
-            # Select category
-            if specific_category:
-                category = specific_category
-            else:
-                category = random.choice(categories)
-            
-            # Generate idea
-            log_generation_message(f"Generating idea for category: {category}")
-            
-            # Try to generate with retries
-            success = False
-            error_message = ""
-            idea_text = None
-            filename = None
-            
-            for attempt in range(MAX_RETRIES):
-                try:
-                    # Note: The parameter order in generate_idea_with_ollama is (category, model, template)
-                    # And it returns a tuple of (generated_text, filename)
-                    idea_text, filename = generate_idea_with_ollama(category, model, template)
-                    success = True
-                    break
-                except Exception as e:
-                    error_message = str(e)
-                    log_generation_message(f"Ollama API error (attempt {attempt+1}/{MAX_RETRIES}): {error_message}")
-                    time.sleep(RETRY_DELAY)
-            
-            if not success:
-                log_generation_message(f"Error generating idea with Ollama: {error_message}")
-                with generation_lock:
-                    generation_stats["errors"] += 1
-                continue
-            
-            # Check for similarity
-            is_similar = False
-            for existing_idea in existing_ideas:
-                if is_similar_idea(idea_text, existing_idea, similarity_threshold):
-                    is_similar = True
-                    break
-            
-            if is_similar:
-                log_generation_message("Skipping similar idea")
-                with generation_lock:
-                    generation_stats["skipped"] += 1
-                continue
-            
-            # Save idea using the filename returned by generate_idea_with_ollama
-            file_path = save_idea(idea_text, category, filename)
-            
-            # Extract name and description for database
-            name_match = re.search(r'## 1\. Assistant Name:\s*\n\s*(.+?)\s*\n', idea_text, re.DOTALL)
-            name = name_match.group(1).strip() if name_match else f"Unnamed Assistant {count+1}"
-            
-            desc_match = re.search(r'## 2\. Short Description:\s*\n\s*(.+?)\s*\n## ', idea_text, re.DOTALL)
-            description = desc_match.group(1).strip() if desc_match else ""
-            
-            # Get relative path for database
-            rel_path = os.path.relpath(file_path, REPO_PATH)
-            
-            # Save to database
-            save_idea_to_db(name, description, category, rel_path, idea_text)
-            
-            # Update existing ideas for similarity check
-            existing_ideas.append(idea_text)
-            
-            # Update stats
-            with generation_lock:
-                generation_stats["generated"] += 1
-            
-            log_generation_message(f"Generated and saved idea: {name}")
-            
-            # Clean up memory
-            if count % 10 == 0:
-                gc.collect()
-            
-            count += 1
-            
-        except Exception as e:
-            log_generation_message(f"Error: {str(e)}")
-            with generation_lock:
-                generation_stats["errors"] += 1
-    
-    # Update the index file
-    try:
-        update_index()
-        log_generation_message("Updated index file")
-    except Exception as e:
-        log_generation_message(f"Error updating index: {str(e)}")
+    def on_event(event, data):
+        if event == "started":
+            job.log(f"Generating idea for category: {data['category']}")
+            job.count("attempts")
+        elif event == "skipped":
+            job.log("Skipping similar idea" + (" (aborted early)" if data.get('early') else ""))
+            job.count("skipped", data.get('latency'))
+        elif event == "generated":
+            # The engine has already queued the idea for the database
+            job.log(f"Generated and saved idea: {data['name']}")
+            job.events.publish("idea", name=data['name'], category=data['category'],
+                               path=os.path.relpath(data['file_path'], REPO_PATH),
+                               date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            job.count("generated", data.get('latency'))
+        elif event == "error":
+            job.log(f"Error generating idea with Ollama: {data['error']}")
+            job.count("errors", data.get('latency'))
+    
+    # Generate ideas, sharing the Ollama request budget with the other jobs
+    engine = GenerationEngine(
+        model, template, categories, params['similarity_threshold'],
+        concurrency=params['concurrency'],
+        specific_category=params['specific_category'],
+        stream=params['stream'],
+        stop_event=job.stop_event,
+        on_event=on_event,
+        limiter=job_manager.limiter,
+        adaptive_concurrency=params.get('adaptive', False)
+    )
+    engine.run(params['num_ideas'], unlimited=params['unlimited'])
     
-    log_generation_message("Generation complete")
-    generation_active = False
-
-def log_generation_message(message):
-    """Log a message from the generation thread."""
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    with generation_lock:
-        generation_stats["log"].append(f"[{timestamp}] {message}")
-        # Keep only the last 100 log messages
-        if len(generation_stats["log"]) > 100:
-            generation_stats["log"] = generation_stats["log"][-100:]
+    if engine.controller is not None:
+        job.log(f"Concurrency settled at {engine.controller.limit} requests")
+    if engine.failure:
+        raise RuntimeError(engine.failure)
+    job.log("Generation complete")
 
 @app.route('/')
 def index():
@@ -378,15 +414,18 @@ def index():
     # Get filter parameters
     category_filter = request.args.get('category', '')
     search_query = request.args.get('search', '')
-    sort_by = request.args.get('sort', 'created_at')
+    sort_by = request.args.get('sort', 'relevance' if search_query else 'created_at')
     sort_order = request.args.get('order', 'desc')
     
-    # Get ideas from database
-    ideas = get_ideas_from_db(
+    cursor = request.args.get('cursor')
+    
+    # Get the first page of ideas from database; later pages are fetched from the API
+    ideas, next_cursor = get_ideas_page(
         category_filter=category_filter,
         search_query=search_query,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor
     )
     
     # Get categories from database
@@ -395,12 +434,37 @@ def index():
     
     return render_template('index.html', 
                           ideas=ideas,
+                          next_cursor=next_cursor,
                           categories=category_names,
                           category_filter=category_filter,
                           search_query=search_query,
                           sort_by=sort_by,
                           sort_order=sort_order)
 
+@app.route('/api/ideas')
+def api_ideas():
+    """Return one page of ideas as JSON, for infinite scrolling."""
+    search_query = request.args.get('search', '')
+    cursor = request.args.get('cursor')
+    if cursor and decode_cursor(cursor) is None:
+        return jsonify({"error": "Invalid cursor"}), 400
+    
+    ideas, next_cursor = get_ideas_page(
+        category_filter=request.args.get('category', ''),
+        search_query=search_query,
+        sort_by=request.args.get('sort', 'relevance' if search_query else 'created_at'),
+        sort_order=request.args.get('order', 'desc'),
+        cursor=cursor,
+        page_size=request.args.get('limit', type=int)
+    )
+    
+    for idea in ideas:
+        idea['url'] = url_for('view_idea', idea_path=idea['path'])
+        idea['snippet'] = str(idea['snippet']) if idea['snippet'] else None
+        del idea['sort_key']
+    
+    return jsonify({"ideas": ideas, "next_cursor": next_cursor})
+
 @app.route('/idea/<int:idea_id>')
 def view_idea_by_id(idea_id):
     """Render a page for a specific idea by ID."""
@@ -408,19 +472,8 @@ def view_idea_by_id(idea_id):
     if not idea:
         abort(404)
     
-    # Get all ideas for navigation
-    all_ideas = get_ideas_from_db(sort_by="created_at", sort_order="desc")
-    
-    # Find current idea index
-    current_index = -1
-    for i, item in enumerate(all_ideas):
-        if item['id'] == idea_id:
-            current_index = i
-            break
-    
     # Get previous and next ideas for navigation
-    prev_idea = all_ideas[current_index + 1] if current_index < len(all_ideas) - 1 else None
-    next_idea = all_ideas[current_index - 1] if current_index > 0 else None
+    prev_idea, next_idea = get_adjacent_ideas(idea)
     
     return render_template('idea.html', 
                           idea=idea,
@@ -472,24 +525,13 @@ def view_idea(idea_path):
                 'path': file_path,
                 'date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 'raw_content': content,
-                'content_html': markdown.markdown(content, extensions=['tables', 'fenced_code'])
+                'content_html': get_rendered_html(None, None, content)
             }
         else:
             abort(404)
     
-    # Get all ideas for navigation
-    all_ideas = get_ideas_from_db(sort_by="created_at", sort_order="desc")
-    
-    # Find current idea index
-    current_index = -1
-    for i, item in enumerate(all_ideas):
-        if item['path'] == file_path:
-            current_index = i
-            break
-    
     # Get previous and next ideas for navigation
-    prev_idea = all_ideas[current_index + 1] if current_index < len(all_ideas) - 1 else None
-    next_idea = all_ideas[current_index - 1] if current_index > 0 else None
+    prev_idea, next_idea = get_adjacent_ideas(idea)
     
     return render_template('idea.html', 
                           idea=idea,
@@ -521,8 +563,6 @@ def category(category_name):
 @app.route('/generate', methods=['GET', 'POST'])
 def generate():
     """Render the idea generation page."""
-    global generation_active, generation_thread
-    
     # Get available models
     try:
         models = get_available_models()
@@ -535,61 +575,100 @@ def generate():
     if request.method == 'POST':
         action = request.form.get('action')
         
-        if action == 'start' and not generation_active:
+        if action == 'start':
             # Get generation parameters
-            model = request.form.get('model', DEFAULT_MODEL)
-            num_ideas = int(request.form.get('num_ideas', 10))
             unlimited = request.form.get('unlimited') == 'on'
-            similarity_threshold = float(request.form.get('similarity_threshold', 0.8))
-            specific_category = request.form.get('specific_category', '')
-            
-            if specific_category == '':
-                specific_category = None
-            
-            # Start generation thread
-            generation_active = True
-            generation_thread = threading.Thread(
-                target=generate_ideas_thread,
-                args=(model, num_ideas, similarity_threshold, unlimited, specific_category)
-            )
-            generation_thread.daemon = True
-            generation_thread.start()
+            num_ideas = int(request.form.get('num_ideas', 10))
+            params = {
+                'model': request.form.get('model', DEFAULT_MODEL),
+                'num_ideas': num_ideas,
+                'unlimited': unlimited,
+                'similarity_threshold': float(request.form.get('similarity_threshold', 0.8)),
+                'specific_category': request.form.get('specific_category', '') or None,
+                'concurrency': max(1, min(int(request.form.get('concurrency', DEFAULT_CONCURRENCY)),
+                                          job_manager.ollama_concurrency)),
+                'stream': request.form.get('stream') == 'on',
+                'adaptive': request.form.get('adaptive') == 'on'
+            }
             
-            return redirect(url_for('generate'))
+            # Queue the job; it starts as soon as a job slot is free
+            job = job_manager.submit(run_generation_job, params, total=0 if unlimited else num_ideas)
+            return redirect(url_for('generate', job=job.id))
         
-        elif action == 'stop' and generation_active:
-            # Stop generation
-            generation_active = False
-            return redirect(url_for('generate'))
+        elif action == 'stop':
+            # Stop generation once in-flight requests have finished
+            job_id = request.form.get('job_id', '')
+            job_manager.stop(job_id)
+            return redirect(url_for('generate', job=job_id))
+    
+    job = job_manager.get(request.args.get('job', '')) or job_manager.latest()
     
     return render_template('generate.html', 
                           models=models,
                           categories=categories,
-                          generation_active=generation_active,
-                          generation_stats=generation_stats)
+                          jobs=[j.to_dict() for j in job_manager.jobs()],
+                          job=job.to_dict() if job else None,
+                          max_concurrency=job_manager.ollama_concurrency)
+
+@app.route('/jobs')
+def jobs():
+    """API endpoint to list the generation jobs, newest first."""
+    return jsonify([job.to_dict() for job in job_manager.jobs()])
+
+@app.route('/jobs/<job_id>')
+def job_status(job_id):
+    """API endpoint to get the status of a generation job."""
+    job = job_manager.get(job_id)
+    if job is None:
+        abort(404)
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/stop', methods=['POST'])
+def stop_job(job_id):
+    """API endpoint to stop a generation job."""
+    if not job_manager.stop(job_id):
+        abort(404)
+    return jsonify(job_manager.get(job_id).to_dict())
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Stream the events of a generation job as server-sent events until it finishes."""
+    job = job_manager.get(job_id)
+    if job is None:
+        abort(404)
+    
+    events = job.events
+    # Browsers send Last-Event-ID when they reconnect, so no event is delivered twice
+    after = request.headers.get('Last-Event-ID', type=int)
+    if after is None:
+        after = request.args.get('after', 0, type=int)
+    if events.closed and not events.events_since(after):
+        # 204 tells the browser not to reconnect
+        return Response(status=204)
+    
+    def stream_events():
+        for batch in events.subscribe(after):
+            if batch is None:
+                # Heartbeat; writing to a closed connection ends the generator
+                yield ": keep-alive\n\n"
+                continue
+            for event in batch:
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+    
+    return Response(stream_events(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 @app.route('/generation_status')
 def generation_status():
-    """API endpoint to get the current generation status."""
-    with generation_lock:
-        return jsonify(generation_stats)
-
-@app.route('/generation_log')
-def generation_log():
-    """Stream the generation log as server-sent events."""
-    def generate_log():
-        last_log_length = 0
-        while True:
-            with generation_lock:
-                current_log_length = len(generation_stats["log"])
-                if current_log_length > last_log_length:
-                    new_logs = generation_stats["log"][last_log_length:]
-                    last_log_length = current_log_length
-                    yield f"data: {json.dumps(new_logs)}\n\n"
-            
-            time.sleep(0.5)
-    
-    return Response(generate_log(), mimetype="text/event-stream")
+    """API endpoint to get the status of the most recent generation job."""
+    job = job_manager.latest()
+    return jsonify(job.to_dict() if job else {})
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus endpoint with the generation pipeline's stage timings and idea counters."""
+    registry = get_metrics()
+    registry.set(ACTIVE_JOBS, len(job_manager.active_jobs()))
+    return Response(registry.render_prometheus(), mimetype="text/plain; version=0.0.4")
 
 def main():
     """Run the Flask app."""
@@ -604,6 +683,10 @@ def main():
         create_database()
         import_existing_ideas()
     
+    # Pick up ideas added or changed on disk since the last run
+    from db_setup import sync_ideas
+    sync_ideas()
+    
     # Run the app
     app.run(host='127.0.0.1', port=5000, debug=True, threaded=True)
 